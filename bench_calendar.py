@@ -0,0 +1,84 @@
+"""Benchmark regression checks for every dayNN/partN.py compute.
+
+Deselected by default, run them with ``pytest -m benchmark``.
+``--bench-update`` stores the medians in ``benchmarks.json``, later runs
+fail when a part gets slower than ``--bench-max-ratio``.  The committed
+baselines of the ``INPUT_S`` samples are only a starting point: timings
+depend on the machine, so re-record them on the one you compare on.  A
+part without a baseline fails too, so new parts and new inputs get
+recorded instead of silently passing.
+"""
+import contextlib
+import io
+import os.path
+
+import pytest
+
+from support.benchmark import Baselines
+from support.benchmark import benchmark
+from support.benchmark import BenchmarkConfig
+from support.inputs import InputStore
+from support.inputs import YEAR
+from support.runner import discover_parts
+from support.runner import format_ns
+from support.runner import import_part
+from support.runner import Part
+from support.runner import sample_name
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# fewer, shorter rounds than the cli default, the suite has to stay usable
+CONFIG = BenchmarkConfig(
+    warmup_ns=10_000_000,
+    rounds=10,
+    max_ns=2_000_000_000,
+)
+
+
+def _cases():
+    store = InputStore()
+    for part in discover_parts(HERE):
+        yield pytest.param(part, 'INPUT_S', id=f'{part.name}:INPUT_S')
+        if part.input_txt.exists():
+            yield pytest.param(part, 'input.txt', id=f'{part.name}:input.txt')
+        elif (YEAR, part.day) in store:
+            yield pytest.param(part, 'cache', id=f'{part.name}:cache')
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(('part', 'source'), tuple(_cases()))
+def test_benchmark(
+        part: Part,
+        source: str,
+        bench_baselines: Baselines,
+        request: pytest.FixtureRequest,
+) -> None:
+    module = import_part(part)
+    if source == 'input.txt':
+        s = part.input_txt.read_text()
+    elif source == 'cache':
+        s = InputStore().text(YEAR, part.day)
+    else:
+        s = getattr(module, sample_name(module))
+
+    name = f'{part.name}:{source}'
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = benchmark(module.compute, s, name=name, config=CONFIG)
+
+    if request.config.getoption('--bench-update'):
+        bench_baselines.update(result)
+        return
+
+    ratio = bench_baselines.ratio(result)
+    if ratio is None:
+        pytest.fail(
+            f'no baseline for {name}, record it with '
+            f'`pytest -m benchmark bench_calendar.py --bench-update`',
+        )
+
+    max_ratio = request.config.getoption('--bench-max-ratio')
+    baseline = bench_baselines.get(name)
+    assert ratio <= max_ratio, (
+        f'{name} median {format_ns(int(result.median))} is {ratio:.2f}x '
+        f'the baseline {format_ns(int(baseline.median))}'
+    )
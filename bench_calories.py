@@ -0,0 +1,45 @@
+"""day01 on a big inventory file, per line code against the chunked reducer.
+
+Deselected by default, run them with ``pytest -m benchmark``, the file is
+``--bench-parse-mb`` megabytes (default 5).  The chunked reducer only
+scales past one core with ``jobs`` > 1 on a machine that has them.
+"""
+import os
+
+import pytest
+
+from support.benchmark import assert_faster
+from support.benchmark import SCALING_CONFIG
+from support.generators import generate
+from support.topk import top_k_file
+
+
+def calories_lines(path):
+    with open(path) as f:
+        elves = f.read().strip().split('\n\n')
+    sums = [sum(map(int, elf.split('\n'))) for elf in elves]
+    return sorted(sums, reverse=True)[:3]
+
+
+def calories_chunked(path):
+    return top_k_file(path, 3, jobs=1, chunk_size=1 << 20)
+
+
+def calories_pool(path):
+    return top_k_file(path, 3, jobs=os.cpu_count(), chunk_size=1 << 20)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    'fast',
+    (
+        pytest.param(calories_chunked, id='day01-chunked'),
+        pytest.param(calories_pool, id='day01-pool'),
+    ),
+)
+def test_calories(fast, tmp_path, request: pytest.FixtureRequest) -> None:
+    mb = request.config.getoption('--bench-parse-mb')
+    sample = generate(1, 1_000)
+    path = tmp_path / 'input.txt'
+    path.write_text(generate(1, max(int(1_000 * mb * 1e6 / len(sample)), 1)))
+    assert_faster(calories_lines, fast, path, config=SCALING_CONFIG)
@@ -0,0 +1,121 @@
+"""Micro benchmarks of the ``Direction4`` fast path.
+
+Deselected by default, run them with ``pytest -m benchmark``.  The sand
+simulation is the step loop ``day14/part2.compute`` used before it moved
+to a row sweep, once written against ``Direction4.apply`` and once
+against the plain ``DELTA_*`` constants.
+"""
+import itertools
+import re
+from itertools import pairwise
+
+import pytest
+
+from support import DELTA_DOWN
+from support import DELTA_LEFT
+from support import DELTA_RIGHT
+from support import Direction4
+from support.benchmark import assert_faster
+from support.benchmark import BenchmarkConfig
+
+CONFIG = BenchmarkConfig(warmup_ns=10_000_000, rounds=10, max_ns=2_000_000_000)
+
+# the day14 example, bigger caves only make the benchmark slower
+WALLS = '''\
+498,4 -> 498,6 -> 496,6
+503,4 -> 502,4 -> 502,9 -> 494,9
+'''
+
+
+def parse_walls(s):
+    walls = set()
+    for line in s.splitlines():
+        coords = zip(*[map(int, re.findall(r'\d+', line))] * 2)
+        for (a_x, a_y), (o_x, o_y) in pairwise(coords):
+            for xx in range(min(a_x, o_x), max(a_x, o_x) + 1):
+                for yy in range(min(a_y, o_y), max(a_y, o_y) + 1):
+                    walls.add((xx, yy))
+    return walls
+
+
+def pour_apply(walls):
+    blocked = set(walls)
+    floor = max(y for _, y in walls) + 2
+    for num_sand in itertools.count():
+        pos = (500, 0)
+        if pos in blocked:
+            return num_sand
+        while True:
+            below = Direction4.DOWN.apply(*pos)
+            if below[1] == floor:
+                break
+            if below not in blocked:
+                pos = below
+            elif Direction4.LEFT.apply(*below) not in blocked:
+                pos = Direction4.LEFT.apply(*below)
+            elif Direction4.RIGHT.apply(*below) not in blocked:
+                pos = Direction4.RIGHT.apply(*below)
+            else:
+                break
+        blocked.add(pos)
+
+
+def pour_deltas(walls):
+    blocked = set(walls)
+    floor = max(y for _, y in walls) + 2
+    (d_x, d_y), (l_x, _), (r_x, _) = DELTA_DOWN, DELTA_LEFT, DELTA_RIGHT
+    for num_sand in itertools.count():
+        x, y = 500, 0
+        if (x, y) in blocked:
+            return num_sand
+        while y + d_y != floor:
+            y += d_y
+            if (x, y) not in blocked:
+                continue
+            elif (x + l_x, y) not in blocked:
+                x += l_x
+            elif (x + r_x, y) not in blocked:
+                x += r_x
+            else:
+                y -= d_y
+                break
+        blocked.add((x, y))
+
+
+def rotations_rebuilt():
+    # what cw / ccw / opposite used to do on every access
+    for d in Direction4:
+        vals = tuple(type(d).__members__.values())
+        vals[(vals.index(d) + 1) % len(vals)]
+        vals[(vals.index(d) - 1) % len(vals)]
+        vals[(vals.index(d) + 2) % len(vals)]
+
+
+def rotations_tables():
+    for d in Direction4:
+        d.cw
+        d.ccw
+        d.opposite
+
+
+def test_rotation_tables() -> None:
+    for d in Direction4:
+        assert d.cw.ccw is d
+        assert d.opposite is d.cw.cw
+        assert d.apply(*d.opposite.apply(0, 0)) == (0, 0)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    ('slow', 'fast', 'args'),
+    (
+        pytest.param(
+            pour_apply, pour_deltas,
+            (parse_walls(WALLS),),
+            id='day14-step',
+        ),
+        pytest.param(rotations_rebuilt, rotations_tables, (), id='rotations'),
+    ),
+)
+def test_fast_path(slow, fast, args) -> None:
+    assert_faster(slow, fast, *args, config=CONFIG)
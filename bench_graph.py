@@ -0,0 +1,96 @@
+"""``support.graph`` against networkx on generated maps.
+
+Deselected by default, run them with ``pytest -m benchmark``.  Both sides
+build their graph from the parsed input and then search it, the networkx
+side is what day12 and day16 did before moving to ``CSRGraph``.
+"""
+import networkx as nx
+import numpy as np
+import pytest
+
+from day12.part1 import node_id
+from day12.part1 import parse_map
+from day12.part1 import prepare_graph
+from day16.part1 import make_graph
+from support import Grid
+from support.benchmark import assert_faster
+from support.benchmark import SCALING_CONFIG
+from support.generators import generate
+from support.graph import all_pairs
+from support.graph import bfs
+from support.grid import OFFSETS_4
+
+
+def heightmap_nx(grid):
+    G = nx.DiGraph()
+    heights = Grid(grid.data.astype(np.int16))
+    neighbours = heights.adjacent_4(fill=1000)
+    for (x_d, y_d), adj_heights in zip(OFFSETS_4, neighbours):
+        climbable = adj_heights <= heights.data + 1
+        G.add_edges_from(
+            ((x, y), (x + x_d, y + y_d))
+            for x, y in heights.coords(climbable)
+        )
+    return G
+
+
+def climb_nx(start, end, grid):
+    return len(nx.shortest_path(heightmap_nx(grid), start, end)) - 1
+
+
+def climb_csr(start, end, grid):
+    end_id = node_id(grid, end)
+    return int(bfs(prepare_graph(grid), node_id(grid, start), end_id)[end_id])
+
+
+def lowest(grid):
+    return grid.coords(grid.data == ord('a'))
+
+
+def hike_nx(start, end, grid):
+    lengths = nx.multi_source_dijkstra_path_length(heightmap_nx(grid), lowest(grid))
+    return lengths[end]
+
+
+def hike_csr(start, end, grid):
+    starts = [node_id(grid, coord) for coord in lowest(grid)]
+    end_id = node_id(grid, end)
+    return int(bfs(prepare_graph(grid), starts, end_id)[end_id])
+
+
+def valves_nx(s):
+    graph, _ = make_graph(s)
+    G = nx.DiGraph([
+        (graph.labels[a], graph.labels[b])
+        for a in range(graph.n_nodes)
+        for b in graph.neighbours(a).tolist()
+    ])
+    dist = nx.floyd_warshall(G)
+    return [[dist[a][b] for b in graph.labels] for a in graph.labels]
+
+
+def valves_csr(s):
+    graph, _ = make_graph(s)
+    return all_pairs(graph).tolist()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    ('slow', 'fast', 'make_args'),
+    (
+        pytest.param(
+            climb_nx, climb_csr, lambda: parse_map(generate(12, 300)),
+            id='day12-shortest-path',
+        ),
+        pytest.param(
+            hike_nx, hike_csr, lambda: parse_map(generate(12, 300)),
+            id='day12-multi-source',
+        ),
+        pytest.param(
+            valves_nx, valves_csr, lambda: (generate(16, 150),),
+            id='day16-all-pairs',
+        ),
+    ),
+)
+def test_graph(slow, fast, make_args) -> None:
+    assert_faster(slow, fast, *make_args(), config=SCALING_CONFIG)
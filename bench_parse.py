@@ -0,0 +1,108 @@
+"""Parsing speed of ``support.parse`` against the usual per line code.
+
+Deselected by default, run them with ``pytest -m benchmark``, the
+generated inputs are ``--bench-parse-mb`` megabytes (default 5, try 100).
+Each case parses the same input both ways and checks the results match.
+"""
+import re
+
+import numpy as np
+import pytest
+
+from support.benchmark import assert_faster
+from support.benchmark import SCALING_CONFIG
+from support.generators import generate
+from support.parse import Fields
+from support.parse import int_array
+from support.parse import int_rows
+from support.parse import records
+
+
+def generate_mb(day: int, mb: float) -> str:
+    sample = generate(day, 1_000)
+    return generate(day, max(int(1_000 * mb * 1e6 / len(sample)), 1))
+
+
+def calories_lines(s):
+    sums = [0]
+    for line in s.splitlines():
+        if line:
+            sums[-1] += int(line)
+        else:
+            sums.append(0)
+    return sums
+
+
+def calories_records(s):
+    return [sum(map(int, elf)) for elf in records(s)]
+
+
+def calories_array(s):
+    return int_array(s).record_sums().tolist()
+
+
+def sections_lines(s):
+    return [tuple(map(int, re.findall(r'\d+', line))) for line in s.splitlines()]
+
+
+def sections_rows(s):
+    return list(int_rows(s, 4, signed=False))
+
+
+def moves_lines(s):
+    moves = s.split('\n\n')[1]
+    return [tuple(map(int, re.findall(r'\d+', line))) for line in moves.splitlines()]
+
+
+MOVE = Fields('move {} from {} to {}', int, int, int)
+
+
+def moves_fields(s):
+    moves = s.split('\n\n')[1]
+    return [MOVE(line) for line in moves.splitlines()]
+
+
+def sensors_lines(s):
+    return [tuple(map(int, re.findall(r'-?\d+', line))) for line in s.splitlines()]
+
+
+def sensors_rows(s):
+    return list(int_rows(s, 4))
+
+
+def cubes_rows(s):
+    return np.array(list(int_rows(s, 3)), dtype=np.int64)
+
+
+def cubes_array(s):
+    return int_array(s).rows(3)
+
+
+def mixing_lines(s):
+    return [int(n) for n in s.splitlines()]
+
+
+def mixing_array(s):
+    return int_array(s).values.tolist()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    ('day', 'before', 'after'),
+    (
+        pytest.param(1, calories_lines, calories_records, id='day01-records'),
+        pytest.param(1, calories_records, calories_array, id='day01-int_array'),
+        pytest.param(4, sections_lines, sections_rows, id='day04-int_rows'),
+        pytest.param(5, moves_lines, moves_fields, id='day05-Fields'),
+        pytest.param(15, sensors_lines, sensors_rows, id='day15-int_rows'),
+        pytest.param(18, cubes_rows, cubes_array, id='day18-int_array'),
+        pytest.param(20, mixing_lines, mixing_array, id='day20-int_array'),
+    ),
+)
+def test_parse(day, before, after, request: pytest.FixtureRequest) -> None:
+    s = generate_mb(day, request.config.getoption('--bench-parse-mb'))
+    # big inputs, a handful of single calls is plenty
+    assert_faster(
+        before, after, s,
+        config=SCALING_CONFIG, check=np.testing.assert_array_equal,
+    )
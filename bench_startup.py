@@ -0,0 +1,51 @@
+"""Import time budget of every dayNN/partN.py.
+
+Deselected by default, run them with ``pytest -m benchmark``.  Fails
+when importing a part (and everything it imports, ``support`` included)
+takes longer than ``--startup-budget-ms``, e.g. because a heavy library
+ended up imported at the top of ``support``.  pytest and numpy alone
+take a few hundred ms, the default budget of a second leaves room for
+slow or busy machines.
+"""
+import os.path
+import subprocess
+import sys
+
+import pytest
+
+from support.runner import discover_parts
+from support.runner import Part
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# fresh interpreters are noisy, the best of a few is what a user sees
+RUNS = 5
+
+TIME_IMPORT = '''\
+import time
+t0 = time.perf_counter_ns()
+import {module}
+print(time.perf_counter_ns() - t0)
+'''
+
+
+def import_time_ns(module: str) -> int:
+    """Wall time of ``import module`` in a fresh interpreter."""
+    proc = subprocess.run(
+        (sys.executable, '-c', TIME_IMPORT.format(module=module)),
+        cwd=HERE, capture_output=True, text=True, check=True,
+    )
+    return int(proc.stdout.splitlines()[-1])
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    'part', tuple(discover_parts(HERE)), ids=lambda part: part.name,
+)
+def test_startup(part: Part, request: pytest.FixtureRequest) -> None:
+    budget_ms = request.config.getoption('--startup-budget-ms')
+    best_ms = min(import_time_ns(part.module) for _ in range(RUNS)) / 1e6
+    assert best_ms <= budget_ms, (
+        f'importing {part.name} takes {best_ms:.0f} ms, '
+        f'the budget is {budget_ms:.0f} ms'
+    )
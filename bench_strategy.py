@@ -0,0 +1,66 @@
+"""day02 scoring, per round dict lookups against the 9 line score table,
+and many rulesets scored one pass each against all of them at once.
+
+Deselected by default, run them with ``pytest -m benchmark``, the guides
+are ``--bench-parse-mb`` megabytes (default 5).
+"""
+import pytest
+
+from support.benchmark import assert_faster
+from support.benchmark import SCALING_CONFIG
+from support.generators import generate
+from support.rps import column_permutations
+from support.rps import line_counts
+from support.rps import MOVE_SCORES
+from support.rps import OUTCOME_SCORES
+from support.rps import score
+from support.rps import scores
+
+
+def moves_dicts(s):
+    """day02/part1 before the score table."""
+    move_points = {'X': 1, 'Y': 2, 'Z': 3}
+    counter_to_win = {'A': 'Y', 'B': 'Z', 'C': 'X'}
+    counter_to_draw = {'A': 'X', 'B': 'Y', 'C': 'Z'}
+    my_score = 0
+    for line in s.splitlines():
+        him, me = line.split()
+        my_score += move_points[me]
+        if counter_to_draw[him] == me:
+            my_score += 3
+        if counter_to_win[him] == me:
+            my_score += 6
+    return my_score
+
+
+def moves_table(s):
+    return score(line_counts(s), MOVE_SCORES)
+
+
+RULESETS = {
+    'move': MOVE_SCORES,
+    'outcome': OUTCOME_SCORES,
+    **column_permutations(),
+}
+
+
+def rulesets_passes(s):
+    return {name: score(line_counts(s), table) for name, table in RULESETS.items()}
+
+
+def rulesets_batch(s):
+    return scores(line_counts(s), RULESETS)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    ('slow', 'fast'),
+    (
+        pytest.param(moves_dicts, moves_table, id='day02-table'),
+        pytest.param(rulesets_passes, rulesets_batch, id='day02-rulesets'),
+    ),
+)
+def test_strategy(slow, fast, request: pytest.FixtureRequest) -> None:
+    mb = request.config.getoption('--bench-parse-mb')
+    s = generate(2, max(int(mb * 1e6 / len('A X\n')), 1))
+    assert_faster(slow, fast, s, config=SCALING_CONFIG)
@@ -0,0 +1,42 @@
+import os.path
+from typing import Generator
+
+import pytest
+
+from support.benchmark import Baselines
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup('benchmark', 'benchmark regression checks')
+    group.addoption(
+        '--bench-baselines', default=os.path.join(HERE, 'benchmarks.json'),
+        help='json file with the stored baselines',
+    )
+    group.addoption(
+        '--bench-update', action='store_true',
+        help='record the measured medians as the new baselines',
+    )
+    group.addoption(
+        '--bench-max-ratio', type=float, default=1.5,
+        help='fail when a median is slower than baseline * ratio',
+    )
+    group.addoption(
+        '--startup-budget-ms', type=float, default=1000,
+        help='fail when importing a part takes longer than this',
+    )
+    group.addoption(
+        '--bench-parse-mb', type=float, default=5,
+        help='size of the generated inputs of the parsing benchmarks',
+    )
+
+
+@pytest.fixture(scope='session')
+def bench_baselines(
+        request: pytest.FixtureRequest,
+) -> Generator[Baselines, None, None]:
+    baselines = Baselines(request.config.getoption('--bench-baselines'))
+    yield baselines
+    if request.config.getoption('--bench-update'):
+        baselines.save()
@@ -1,12 +1,21 @@
-import argparse
 import os.path
+import random
+from typing import Iterable
 
 import pytest
 
+from support import iter_lines
+from support import streaming
 from support import timing
+from support.cli import part_main
+from support.generators import register
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
+DAY = 0
+# generated input sizes for `benchmark --scale`
+BENCH_SIZES = (1_000, 10_000, 100_000)
+
 # NOTE: paste test text here
 INPUT_S = '''\
 
@@ -14,21 +23,38 @@ INPUT_S = '''\
 EXPECTED = 1
 
 
-def compute(s: str) -> int:
+def parse(s: str | Iterable[str]) -> list[int]:
     # parse numbers
-    nums = [int(n) for n in s.splitlines()]
-    for n in nums:
-        ...
+    nums = []
+    for line in iter_lines(s):
+        if line:
+            nums.append(int(line))
+    return nums
 
-    # parse lines
-    lines = s.splitlines()
-    for line in lines:
+
+def solve(nums: list[int]) -> int:
+    for n in nums:
         ...
 
     # TODO: implement solution here!
     return 0
 
 
+@streaming
+def compute(s: str | Iterable[str]) -> int:
+    with timing(phase='parse'):
+        nums = parse(s)
+    with timing(phase='solve'):
+        return solve(nums)
+
+
+@register(DAY)
+def generate_input(size: int, rng: random.Random) -> str:
+    """``size`` lines of input in the format of the real one."""
+    # TODO: mimic the real input
+    return ''.join(f'{rng.randint(1, 1000)}\n' for _ in range(size))
+
+
 @pytest.mark.template
 @pytest.mark.parametrize(
     ('input_s', 'expected'),
@@ -42,14 +68,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
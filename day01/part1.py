@@ -1,9 +1,14 @@
-import argparse
 import os.path
+from pathlib import Path
 
 import pytest
 
-from support import timing
+from support import memory_mapped
+from support.cli import part_main
+from support.generators import generate
+from support.inputs import MappedInput
+from support.topk import top_k
+from support.topk import top_k_file
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -27,13 +32,9 @@ INPUT_S = '''\
 EXPECTED = 24000
 
 
-def compute(s: str) -> int:
-    chunks = s.strip().split('\n\n')
-    sums = [
-        sum(map(int, chunk.split('\n')))
-        for chunk in chunks
-    ]
-    return max(sums)
+@memory_mapped
+def compute(s: str | MappedInput) -> int:
+    return top_k(s, 1)[0]
 
 
 @pytest.mark.solved
@@ -47,15 +48,33 @@ def test(input_s: str, expected: int) -> None:
     assert compute(input_s) == expected
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
+@pytest.mark.solved
+@pytest.mark.parametrize(
+    ('chunk_size', 'jobs', 'newline'),
+    (
+            (64 << 20, None, '\n'),
+            (1_000, 1, '\n'),
+            (1_000, 2, '\n'),
+            (1_000, 2, '\r\n'),
+    ),
+)
+def test_top_k_file(
+        chunk_size: int,
+        jobs: int | None,
+        newline: str,
+        tmp_path: Path,
+) -> None:
+    s = generate(1, 1_000)
+    path = tmp_path / 'input.txt'
+    path.write_bytes(s.replace('\n', newline).encode())
+    expected = top_k(s, 5)
+    assert top_k_file(path, 5, jobs=jobs, chunk_size=chunk_size) == expected
+    with MappedInput(path) as mapped:  # what the cli hands compute
+        assert compute(mapped) == expected[0]
 
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
 
-    return 0
+def main() -> int:
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
@@ -1,9 +1,12 @@
-import argparse
 import os.path
 
 import pytest
 
-from support import timing
+from support import memory_mapped
+from support.cli import part_main
+from support.generators import generate
+from support.inputs import MappedInput
+from support.topk import top_k
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -27,13 +30,9 @@ INPUT_S = '''\
 EXPECTED = 45000
 
 
-def compute(s: str) -> int:
-    chunks = s.strip().split('\n\n')
-    sums = [
-        sum(map(int, chunk.split('\n')))
-        for chunk in chunks
-    ]
-    return sum(sorted(sums[-3:]))
+@memory_mapped
+def compute(s: str | MappedInput) -> int:
+    return sum(top_k(s, 3))
 
 
 @pytest.mark.solved
@@ -41,21 +40,27 @@ def compute(s: str) -> int:
     ('input_s', 'expected'),
     (
             (INPUT_S, EXPECTED),
+            # the best elves are not the last ones
+            ('9\n\n8\n\n1\n\n7\n\n2\n', 24),
     ),
 )
 def test(input_s: str, expected: int) -> None:
     assert compute(input_s) == expected
+    assert sum(top_k(iter(input_s.splitlines()), 3)) == expected
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
+@pytest.mark.solved
+@pytest.mark.parametrize('k', (1, 3, 10, 1_000))
+def test_top_k(k: int) -> None:
+    s = generate(1, 500, seed=k)
+    totals = (sum(map(int, elf.split())) for elf in s.split('\n\n'))
+    expected = sorted(totals, reverse=True)[:k]
+    assert top_k(s, k) == expected
+    assert top_k(iter(s.splitlines()), k) == expected
 
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
 
-    return 0
+def main() -> int:
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
@@ -1,9 +1,18 @@
-import argparse
+import collections
 import os.path
+from typing import Any
+from typing import Callable
 
 import pytest
 
-from support import timing
+from support import memory_mapped
+from support.cli import part_main
+from support.generators import generate
+from support.inputs import MappedInput
+from support.rps import line_counts
+from support.rps import LINES
+from support.rps import MOVE_SCORES
+from support.rps import score
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -22,36 +31,9 @@ C scissors  Z
 """
 
 
-def compute(s: str) -> int:
-    move_points = {
-        'X': 1,
-        'Y': 2,
-        'Z': 3,
-    }
-    counter_to_win = {
-        'A': 'Y',
-        'B': 'Z',
-        'C': 'X',
-    }
-    counter_to_draw = {
-        'A': 'X',
-        'B': 'Y',
-        'C': 'Z',
-    }
-
-    my_score = 0
-
-    # parse lines
-    lines = s.splitlines()
-    for line in lines:
-        him, me = line.split()
-        my_score += move_points[me]
-        if counter_to_draw[him] == me:
-            my_score += 3
-        if counter_to_win[him] == me:
-            my_score += 6
-
-    return my_score
+@memory_mapped
+def compute(s: str | MappedInput) -> int:
+    return score(line_counts(s), MOVE_SCORES)
 
 
 @pytest.mark.solved
@@ -65,15 +47,25 @@ def test(input_s: str, expected: int) -> None:
     assert compute(input_s) == expected
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
+@pytest.mark.solved
+@pytest.mark.parametrize(
+    'convert',
+    (
+            str.splitlines,
+            lambda s: s.replace('\n', '\r\n'),
+            lambda s: s.rstrip('\n'),
+            lambda s: s.replace('\n', '\n\n'),
+    ),
+)
+def test_line_counts(convert: Callable[[str], Any]) -> None:
+    s = generate(2, 1_000)
+    counts = collections.Counter(s.splitlines())
+    expected = [counts[line] for line in LINES]
+    assert line_counts(convert(s)).tolist() == expected
 
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
 
-    return 0
+def main() -> int:
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
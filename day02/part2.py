@@ -1,9 +1,17 @@
-import argparse
 import os.path
 
 import pytest
 
-from support import timing
+from support import memory_mapped
+from support.cli import part_main
+from support.generators import generate
+from support.inputs import MappedInput
+from support.rps import column_permutations
+from support.rps import line_counts
+from support.rps import MOVE_SCORES
+from support.rps import OUTCOME_SCORES
+from support.rps import score
+from support.rps import scores
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -24,60 +32,9 @@ him | move    | me
 """
 
 
-def compute(s: str) -> int:
-    move_points = {
-        'X': 1,
-        'Y': 2,
-        'Z': 3,
-    }
-
-    """
-    New strategy:
-    x - loose
-    y - draw
-    z - win
-    """
-
-    counter_to_win = {
-        'A': 'Y',
-        'B': 'Z',
-        'C': 'X',
-    }
-    counter_to_loose = {
-        'A': 'Z',
-        'B': 'X',
-        'C': 'Y',
-    }
-    counter_to_draw = {
-        'A': 'X',
-        'B': 'Y',
-        'C': 'Z',
-    }
-    strategy_to_move = {
-        'X': counter_to_loose,
-        'Y': counter_to_draw,
-        'Z': counter_to_win,
-    }
-    strategy_points = {
-        'X': 0,
-        'Y': 3,
-        'Z': 6,
-    }
-
-    my_score = 0
-
-    # parse lines
-    lines = s.splitlines()
-    for line in lines:
-        him, ordered_strategy = line.split()
-        # choose move by strategy
-        strategy = strategy_to_move[ordered_strategy]
-        my_move = strategy[him]
-        # points
-        my_score += move_points[my_move]
-        my_score += strategy_points[ordered_strategy]
-
-    return my_score
+@memory_mapped
+def compute(s: str | MappedInput) -> int:
+    return score(line_counts(s), OUTCOME_SCORES)
 
 
 @pytest.mark.solved
@@ -91,15 +48,23 @@ def test(input_s: str, expected: int) -> None:
     assert compute(input_s) == expected
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
+@pytest.mark.solved
+def test_scores() -> None:
+    s = generate(2, 1_000)
+    counts = line_counts(s)
+    rulesets = {
+        'move': MOVE_SCORES,
+        'outcome': OUTCOME_SCORES,
+        **column_permutations(),
+    }
+    expected = {name: score(counts, table) for name, table in rulesets.items()}
+    assert scores(counts, rulesets) == expected
+    assert expected['move'] == expected['XYZ=RPS']
+    assert scores(line_counts(INPUT_S), rulesets)['outcome'] == EXPECTED
 
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
 
-    return 0
+def main() -> int:
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
@@ -1,11 +1,13 @@
-import argparse
 import os.path
 from string import ascii_lowercase
 from string import ascii_uppercase
+from typing import Iterable
 
 import pytest
 
-from support import timing
+from support import iter_lines
+from support import streaming
+from support.cli import part_main
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -26,8 +28,9 @@ priority_mapping = (
 )
 
 
-def compute(s: str) -> int:
-    lines = s.splitlines()
+@streaming
+def compute(s: str | Iterable[str]) -> int:
+    lines = iter_lines(s)
     priorities = []
     for line in lines:
         ll = len(line) // 2
@@ -50,14 +53,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
@@ -1,10 +1,11 @@
-import argparse
 import os.path
-import re
+from typing import Iterable
 
 import pytest
 
-from support import timing
+from support import streaming
+from support.cli import part_main
+from support.parse import int_rows
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -20,11 +21,10 @@ INPUT_S = '''\
 EXPECTED = 4
 
 
-def compute(s: str) -> int:
-    lines = s.splitlines()
+@streaming
+def compute(s: str | Iterable[str]) -> int:
     overlaps = 0
-    for line in lines:
-        a, b, x, y = map(int, re.findall(r'\d+', line))
+    for a, b, x, y in int_rows(s, 4, signed=False):
         A, B = set(range(a, b + 1)), set(range(x, y + 1))
         if A.intersection(B):
             overlaps += 1
@@ -43,14 +43,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
@@ -1,11 +1,14 @@
-import argparse
+import itertools
 import os.path
-import re
 from collections import deque
+from typing import Iterable
 
 import pytest
 
-from support import timing
+from support import iter_lines
+from support import streaming
+from support.cli import part_main
+from support.parse import Fields
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -23,18 +26,21 @@ move 1 from 1 to 2
 '''
 EXPECTED = 'MCD'
 
+MOVE = Fields('move {} from {} to {}', int, int, int)
 
-def compute(s: str) -> int:
-    crates, instructions = s.split('\n\n')
-    crates = crates.splitlines()
+
+@streaming
+def compute(s: str | Iterable[str]) -> int:
+    lines = iter(iter_lines(s))
+    crates = list(itertools.takewhile(bool, lines))  # up to the blank line
     deques = {i: deque() for i in range(1, len(crates[-1].split()) + 1)}
     for line in crates[:-1]:
         for i, letter in enumerate(line[1::4], start=1):
             if letter != ' ':
                 deques[i].appendleft(letter)
 
-    for line in instructions.splitlines():
-        amount, _from, _to = map(int, re.findall(r'\d+', line))
+    for line in lines:
+        amount, _from, _to = MOVE(line)
         to_move = [deques[_from].pop() for _ in range(amount)][::-1]
         deques[_to].extend(to_move)
 
@@ -53,14 +59,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
@@ -1,11 +1,13 @@
-import argparse
 import collections
 import os.path
 from itertools import islice
+from typing import Iterable
 
 import pytest
 
-from support import timing
+from support import iter_lines
+from support import streaming
+from support.cli import part_main
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -27,8 +29,9 @@ def sliding_window(iterable, n):
         yield tuple(window)
 
 
-def compute(s: str) -> int:
-    lines = s.splitlines()
+@streaming
+def compute(s: str | Iterable[str]) -> int:
+    lines = iter_lines(s)
     for line in lines:
         for i, window in enumerate(sliding_window(line, 4)):
             if len(set(window)) == 4:
@@ -50,14 +53,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
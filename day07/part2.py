@@ -1,12 +1,14 @@
-import argparse
 import os.path
 from dataclasses import dataclass
 from dataclasses import field
 from typing import ClassVar
+from typing import Iterable
 
 import pytest
 
-from support import timing
+from support import iter_lines
+from support import streaming
+from support.cli import part_main
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -68,11 +70,12 @@ class Directory:
         return self.path
 
 
-def compute(s: str) -> int:
+@streaming
+def compute(s: str | Iterable[str]) -> int:
     # start at root
     current = root = Directory('root')
 
-    lines = s.splitlines()
+    lines = iter_lines(s)
     for line in lines:
         match line.split():
             case '$', 'ls':
@@ -117,14 +120,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
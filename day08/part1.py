@@ -1,12 +1,12 @@
-import argparse
 import os.path
-from itertools import repeat
+from typing import Iterable
 
+import numpy as np
 import pytest
 
-from support import Direction4
-from support import parse_coords_int
-from support import timing
+from support import Grid
+from support import streaming
+from support.cli import part_main
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -21,28 +21,22 @@ INPUT_S = '''\
 EXPECTED = 21
 
 
-def get_in_direction(grid, coords, dir):
-    while True:
-        try:
-            coords = dir.apply(*coords)
-            yield grid[coords]
-        except KeyError:
-            # out of bounds
-            return
+def visible_from_left(heights: np.ndarray) -> np.ndarray:
+    tallest = np.maximum.accumulate(heights, axis=1)
+    # the tallest tree left of each tree, -1 on the edge sees everything
+    before = np.full_like(heights, -1)
+    before[:, 1:] = tallest[:, :-1]
+    return heights > before
 
 
-def compute(s: str) -> int:
-    grid = parse_coords_int(s)
-    visible = 0
-    for pos, tree_height in grid.items():
-        heights_in_dir = map(
-            get_in_direction, repeat(grid), repeat(pos), Direction4
-        )
-        visible += any((
-            all(h < tree_height for h in dir_heights)
-            for dir_heights in heights_in_dir
-        ))
-    return visible
+@streaming
+def compute(s: str | Iterable[str]) -> int:
+    heights = Grid.parse_int(s).data.astype(np.int8)
+    visible = np.zeros(heights.shape, dtype=bool)
+    for k in range(4):
+        # look from each side in turn by rotating the forest
+        visible |= np.rot90(visible_from_left(np.rot90(heights, k)), -k)
+    return int(visible.sum())
 
 
 @pytest.mark.solved
@@ -57,14 +51,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
@@ -1,13 +1,12 @@
-import argparse
-import operator
 import os.path
-from functools import reduce
+from typing import Iterable
 
+import numpy as np
 import pytest
 
-from support import Direction4
-from support import parse_coords_int
-from support import timing
+from support import Grid
+from support import streaming
+from support.cli import part_main
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -22,37 +21,28 @@ INPUT_S = '''\
 EXPECTED = 8
 
 
-def take_while_lower(lim, iterable):
-    for c in iterable:
-        yield c
-        if c >= lim:
-            return  # we've reached limit, stop the iterator
+def view_left(heights: np.ndarray) -> np.ndarray:
+    """How many trees each tree sees to its left."""
+    cols = np.broadcast_to(np.arange(heights.shape[1]), heights.shape)
+    ret = np.zeros(heights.shape, dtype=np.int64)
+    for height in range(10):
+        # column of the closest tree at least this high on the left, the
+        # edge (column 0) stops the view otherwise
+        last = np.maximum.accumulate(np.where(heights >= height, cols, 0), axis=1)
+        blocker = np.zeros_like(last)
+        blocker[:, 1:] = last[:, :-1]
+        ret = np.where(heights == height, cols - blocker, ret)
+    return ret
 
 
-def get_in_direction(grid, coords, dir):
-    while True:
-        try:
-            coords = dir.apply(*coords)
-            yield grid[coords]
-        except KeyError:
-            # out of bounds
-            return
-
-
-def compute(s: str) -> int:
-    grid = parse_coords_int(s)
-    best_visible = 0
-    for pos, tree_height in grid.items():
-        visible = reduce(
-            operator.mul,
-            (
-                sum(1 for _ in take_while_lower(tree_height, get_in_direction(grid, pos, direction)))
-                for direction in Direction4
-            )
-        )
-        if visible > best_visible:
-            best_visible = visible
-    return best_visible
+@streaming
+def compute(s: str | Iterable[str]) -> int:
+    heights = Grid.parse_int(s).data
+    scenic = np.ones(heights.shape, dtype=np.int64)
+    for k in range(4):
+        # look in each direction in turn by rotating the forest
+        scenic *= np.rot90(view_left(np.rot90(heights, k)), -k)
+    return int(scenic.max())
 
 
 @pytest.mark.solved
@@ -67,14 +57,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
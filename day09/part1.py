@@ -1,10 +1,12 @@
-import argparse
 import os.path
+from typing import Iterable
 
 import pytest
 
 from support import Direction4
-from support import timing
+from support import iter_lines
+from support import streaming
+from support.cli import part_main
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -54,7 +56,7 @@ class Rope:
 
 def parse_moves(s):
     moves = []
-    for line in s.splitlines():
+    for line in iter_lines(s):
         letter, amt = line.split()
         moves.append(
             (next(dir for dir in Direction4 if dir.name.startswith(letter)), int(amt))
@@ -62,7 +64,8 @@ def parse_moves(s):
     return moves
 
 
-def compute(s: str) -> int:
+@streaming
+def compute(s: str | Iterable[str]) -> int:
     moves = parse_moves(s)
     r = Rope()
     for dir, amt in moves:
@@ -82,14 +85,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-        return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
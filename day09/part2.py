@@ -1,11 +1,14 @@
-import argparse
 import os.path
 from itertools import pairwise
+from typing import Iterable
 
 import pytest
 
 from support import Direction4
-from support import timing
+from support import iter_lines
+from support import streaming
+from support.cli import part_main
+from support.sparse import SparseGrid
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -27,7 +30,7 @@ class Knot:
     def __init__(self, pos=(0, 0), name=''):
         self.name = name
         self.pos = pos
-        self.seen = [pos, ]
+        self.seen = SparseGrid((pos,))
 
     @property
     def _x(self):
@@ -49,7 +52,7 @@ class Knot:
             self.pos = Direction4.UP.apply(*self.pos)
         elif other._y < self._y:
             self.pos = Direction4.DOWN.apply(*self.pos)
-        self.seen.append(self.pos)
+        self.seen.add(self.pos)
 
     def __sub__(self, other):
         return max((abs(self.pos[0] - other.pos[0]), abs(self.pos[1] - other.pos[1])))
@@ -77,7 +80,7 @@ class Rope:
 
 def parse_moves(s):
     moves = []
-    for line in s.splitlines():
+    for line in iter_lines(s):
         letter, amt = line.split()
         moves.append(
             (next(dir for dir in Direction4 if dir.name.startswith(letter)), int(amt))
@@ -85,12 +88,13 @@ def parse_moves(s):
     return moves
 
 
-def compute(s: str) -> int:
+@streaming
+def compute(s: str | Iterable[str]) -> int:
     moves = parse_moves(s)
     r = Rope(length=10)
     for dir, amt in moves:
         r.move_head(dir, amt)
-    return len(set(r.tail.seen))
+    return len(r.tail.seen)
 
 
 @pytest.mark.solved
@@ -124,14 +128,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-        return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
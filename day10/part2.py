@@ -1,13 +1,18 @@
-import argparse
 import os.path
 from itertools import pairwise
+from typing import Iterable
 
 import pytest
 
-from support import timing
+from support import iter_lines
+from support import streaming
+from support.cli import part_main
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
+# the screen is 240 pixels, at most 120 instructions fit
+BENCH_SIZES = (30, 60, 120)
+
 # NOTE: paste test text here
 INPUT_S = '''\
 addx 15
@@ -167,8 +172,9 @@ def draw_crt(crt: list):
         print()
 
 
-def compute(s: str) -> int:
-    lines = s.splitlines()
+@streaming
+def compute(s: str | Iterable[str]) -> int:
+    lines = iter_lines(s)
     cycle = 0
     reg_x = 1
 
@@ -210,14 +216,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
@@ -1,4 +1,3 @@
-import argparse
 import functools
 import math
 import os.path
@@ -8,14 +7,16 @@ from dataclasses import dataclass
 from dataclasses import field
 from typing import ClassVar
 
-import matplotlib.pyplot as plt
-import networkx as nx
 import pytest
 
-from support import timing
+from support.cli import part_main
+from support.parse import records
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
+# 10_000 rounds, keep the monkeys' hands light
+BENCH_SIZES = (10, 20, 30)
+
 # NOTE: paste test text here
 INPUT_S = '''\
 Monkey 0:
@@ -88,6 +89,9 @@ class Monkey:
 
 
 def show_graph(monkeys):
+    import matplotlib.pyplot as plt
+    import networkx as nx
+
     G = nx.DiGraph()
     G.add_edges_from(
         [(m.name, m.true_monkey) for m in monkeys]
@@ -107,10 +111,9 @@ def square_op(x):
 
 def parse_monkeys(s):
     monkeys = []
-    for monkey_str in s.split('\n\n'):
-        monkey_str = re.sub(r'[,:]', '', monkey_str)
-        for line in monkey_str.splitlines():
-            match line.strip().split():
+    for record in records(s):
+        for line in record:
+            match re.sub(r'[,:]', '', line).split():
                 case 'Monkey', name:
                     name = int(name[0])
                 case 'Starting', 'items', *items:
@@ -164,14 +167,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
@@ -1,11 +1,14 @@
-import argparse
 import os.path
 
-import networkx as nx
+import numpy as np
 import pytest
 
-from support import adjacent_4
+from support import Grid
 from support import timing
+from support.cli import part_main
+from support.graph import bfs
+from support.graph import CSRGraph
+from support.grid import OFFSETS_4
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -20,50 +23,45 @@ abdefghi
 EXPECTED = 29
 
 Coord = tuple[int, int]
-Graph_dict = dict[Coord, int]
-
-
-def parse_map(s: str) -> tuple[Coord, Coord, Graph_dict]:
-    start = None
-    end = None
-    graph_dict = {}
-    for y, line in enumerate(s.splitlines()):
-        for x, c in enumerate(line):
-            if c == 'S':
-                val = 'a'
-                start = (x, y)
-            elif c == 'E':
-                val = 'z'
-                end = (x, y)
-            else:
-                val = c
-            graph_dict[(x, y)] = ord(val)
-    return start, end, graph_dict
-
-
-def prepare_graph(graph_dict: Graph_dict) -> nx.Graph:
-    G = nx.DiGraph()
-
-    for coord, height in graph_dict.items():
-        for adj in adjacent_4(*coord):
-            if adj_height := graph_dict.get(adj, 0):
-                if adj_height in range(0, height + 2):
-                    G.add_edge(coord, adj, cost=adj_height - height)
-    return G
 
 
-def compute(s: str) -> int:
-    start, end, graph_dict = parse_map(s)
-    G = prepare_graph(graph_dict)
+def parse_map(s: str) -> tuple[Coord, Coord, Grid]:
+    grid = Grid.from_chars(s)
+    (start,) = grid.coords(grid.data == ord('S'))
+    (end,) = grid.coords(grid.data == ord('E'))
+    grid[start], grid[end] = ord('a'), ord('z')
+    return start, end, grid
+
+
+def node_id(grid: Grid, coord: Coord) -> int:
+    x, y = coord
+    return y * grid.width + x
 
-    shortest_path = 1_000_000
-    for coord, height in graph_dict.items():
-        if chr(height) == 'a' and nx.has_path(G, coord, end):
-            this_path = len(nx.shortest_path(G, coord, end))
-            if this_path < shortest_path:
-                shortest_path = this_path
 
-    return shortest_path - 1
+def prepare_graph(grid: Grid) -> CSRGraph:
+    heights = Grid(grid.data.astype(np.int16))
+    ids = np.arange(heights.data.size).reshape(heights.data.shape)
+    src, dst = [], []
+    # out of bounds neighbours are too high to ever climb
+    neighbours = heights.adjacent_4(fill=1000)
+    for (x_d, y_d), adj_heights in zip(OFFSETS_4, neighbours):
+        climbable = ids[adj_heights <= heights.data + 1]
+        src.append(climbable)
+        dst.append(climbable + y_d * grid.width + x_d)
+    return CSRGraph.from_edges(ids.size, np.concatenate(src), np.concatenate(dst))
+
+
+def compute(s: str) -> int:
+    with timing(phase='parse'):
+        start, end, grid = parse_map(s)
+    with timing(phase='graph'):
+        graph = prepare_graph(grid)
+
+    # one search from all the lowest squares at once
+    starts = np.flatnonzero(grid.data == ord('a'))
+    end_id = node_id(grid, end)
+    with timing(phase='search'):
+        return int(bfs(graph, starts, target=end_id)[end_id])
 
 
 @pytest.mark.solved
@@ -78,14 +76,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
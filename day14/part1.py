@@ -1,13 +1,15 @@
-import argparse
 import itertools
 import os.path
-import re
 from itertools import pairwise
 
 import pytest
 
-from support import Direction4
-from support import timing
+from support import DELTA_DOWN
+from support import DELTA_LEFT
+from support import DELTA_RIGHT
+from support.cli import part_main
+from support.parse import uints
+from support.sparse import SparseGrid
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -18,66 +20,58 @@ INPUT_S = '''\
 '''
 EXPECTED = 24
 
-BLOCKED = set()
-
-
 def by_pairs(iterable):
     "s -> (s0, s1), (s2, s3), (s4, s5), ..."
     a = iter(iterable)
     return zip(a, a)
 
 
-def parse_walls(s):
-    global BLOCKED
+def parse_walls(s: str) -> SparseGrid:
+    blocked = SparseGrid()
     lines = s.splitlines()
     for line in lines:
-        coords = by_pairs(map(int, re.findall(r'\d+', line)))
+        coords = by_pairs(uints(line))
         for (a_x, a_y), (o_x, o_y) in pairwise(coords):
             if a_x == o_x:
                 range_start, range_stop = min(a_y, o_y), max(a_y, o_y)
-                BLOCKED.update(set((a_x, yy) for yy in range(range_start, range_stop + 1)))
+                blocked.update(set((a_x, yy) for yy in range(range_start, range_stop + 1)))
             else:
                 range_start, range_stop = min(a_x, o_x), max(a_x, o_x)
-                BLOCKED.update(set((xx, a_y) for xx in range(range_start, range_stop + 1)))
-
-
-def left(pos):
-    pos = Direction4.DOWN.apply(*pos)
-    return Direction4.LEFT.apply(*pos)
-
-
-def right(pos):
-    pos = Direction4.DOWN.apply(*pos)
-    return Direction4.RIGHT.apply(*pos)
-
-
-def blocked(pos):
-    return pos in BLOCKED
+                blocked.update(set((xx, a_y) for xx in range(range_start, range_stop + 1)))
+    return blocked
 
 
 def compute(s: str) -> int:
-    parse_walls(s)
-    abbys_level = max(y for _, y in BLOCKED)
-    dispenser_pos = (500, 0)
-    num_sand = 1
+    walls = parse_walls(s)
+    abbys_level = max(y for _, y in walls)
+
+    # step on the packed keys, no tuples in the hot loop
+    blocked = walls.packed
+    codec = walls.codec
+    down = codec.delta(DELTA_DOWN)
+    left = down + codec.delta(DELTA_LEFT)
+    right = down + codec.delta(DELTA_RIGHT)
+    # y is the high field, every key from here on is below the last rock
+    abyss = codec.encode((codec.min_coord, abbys_level + 1))
+    dispenser_pos = codec.encode((500, 0))
 
     for num_sand in itertools.count():
         pos = dispenser_pos
         while True:
 
-            if Direction4.DOWN.apply(*pos) not in BLOCKED:
-                pos = Direction4.DOWN.apply(*pos)
-            elif left(pos) not in BLOCKED:
-                pos = left(pos)
-            elif right(pos) not in BLOCKED:
-                pos = right(pos)
+            if pos + down not in blocked:
+                pos += down
+            elif pos + left not in blocked:
+                pos += left
+            elif pos + right not in blocked:
+                pos += right
             else:
-                BLOCKED.add(pos)
+                blocked[pos] = True
                 break
 
-            if pos[1] > abbys_level:
+            if pos >= abyss:
                 return num_sand
-    return num_sand
+    raise AssertionError('unreachable')
 
 
 @pytest.mark.solved
@@ -92,14 +86,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
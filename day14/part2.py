@@ -1,13 +1,12 @@
-import argparse
-import itertools
 import os.path
-import re
 from itertools import pairwise
 
+import numpy as np
 import pytest
 
-from support import Direction4
-from support import timing
+from support import Grid
+from support.cli import part_main
+from support.parse import uints
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -18,7 +17,7 @@ INPUT_S = '''\
 '''
 EXPECTED = 93
 
-BLOCKED = set()
+Coord = tuple[int, int]
 
 
 def by_pairs(iterable):
@@ -27,64 +26,39 @@ def by_pairs(iterable):
     return zip(a, a)
 
 
-def parse_walls(s):
-    global BLOCKED
-    lines = s.splitlines()
-    for line in lines:
-        coords = by_pairs(map(int, re.findall(r'\d+', line)))
+def parse_walls(s: str) -> set[Coord]:
+    walls = set()
+    for line in s.splitlines():
+        coords = by_pairs(uints(line))
         for (a_x, a_y), (o_x, o_y) in pairwise(coords):
-            if a_x == o_x:
-                range_start, range_stop = min(a_y, o_y), max(a_y, o_y)
-                BLOCKED.update(set((a_x, yy) for yy in range(range_start, range_stop + 1)))
-            else:
-                range_start, range_stop = min(a_x, o_x), max(a_x, o_x)
-                BLOCKED.update(set((xx, a_y) for xx in range(range_start, range_stop + 1)))
-
-
-def left(pos):
-    pos = Direction4.DOWN.apply(*pos)
-    return Direction4.LEFT.apply(*pos)
-
-
-def right(pos):
-    pos = Direction4.DOWN.apply(*pos)
-    return Direction4.RIGHT.apply(*pos)
-
-
-def blocked(pos):
-    return pos in BLOCKED
+            for xx in range(min(a_x, o_x), max(a_x, o_x) + 1):
+                for yy in range(min(a_y, o_y), max(a_y, o_y) + 1):
+                    walls.add((xx, yy))
+    return walls
 
 
 def compute(s: str) -> int:
-    parse_walls(s)
-    abbys_level = max(y for _, y in BLOCKED)
-    s += f'0,{abbys_level + 2} -> 1000,{abbys_level + 2}'
-    parse_walls(s)
-
-    dispenser_pos = (500, 0)
-    num_sand = 1
-
-    for num_sand in itertools.count():
-        pos = dispenser_pos
-        while True:
-
-            if pos in BLOCKED:
-                # now blocked is directly under the dispenser
-                return num_sand
-            elif pos[1] == abbys_level + 1:
-                # effectively draws a line, checks the bottom border
-                BLOCKED.add(pos)
-                break
-
-            if Direction4.DOWN.apply(*pos) not in BLOCKED:
-                pos = Direction4.DOWN.apply(*pos)
-            elif left(pos) not in BLOCKED:
-                pos = left(pos)
-            elif right(pos) not in BLOCKED:
-                pos = right(pos)
-            else:
-                BLOCKED.add(pos)
-                break
+    walls = parse_walls(s)
+    floor = max(y for _, y in walls) + 2
+
+    # sand piles up in a triangle below the source, spreading at most
+    # one column per row
+    rocks = Grid.zeros((500 - floor, 0), (500 + floor, floor - 1))
+    for coord in walls:
+        if coord in rocks:
+            rocks[coord] = True
+
+    # with a floor every cell sand can reach ends up full, so instead of
+    # dropping grains, sweep the reachable cells row by row
+    sand = ~rocks.data[0] & (np.arange(rocks.width) == 500 - rocks.min_coord[0])
+    num_sand = int(sand.sum())
+    for row in rocks.data[1:]:
+        spread = sand.copy()
+        spread[1:] |= sand[:-1]
+        spread[:-1] |= sand[1:]
+        sand = spread & ~row
+        num_sand += int(sand.sum())
+    return num_sand
 
 
 @pytest.mark.solved
@@ -99,14 +73,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
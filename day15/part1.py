@@ -1,12 +1,11 @@
-import argparse
 import os.path
-import re
 from dataclasses import dataclass
 from functools import cached_property
 
 import pytest
 
-from support import timing
+from support.cli import part_main
+from support.parse import int_rows
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -85,8 +84,7 @@ class Sensor:
 def parse(s):
     sensors = set()
     grid = dict()
-    for line in s.strip().splitlines():
-        s_x, s_y, b_x, b_y = map(int, re.findall(r'-?\d+', line))
+    for s_x, s_y, b_x, b_y in int_rows(s, 4):
         sensors.add(Sensor(pos=(s_x, s_y), beacon=(b_x, b_y)))
         grid[(s_x, s_y)] = 'S'
         grid[(b_x, b_y)] = 'B'
@@ -131,14 +129,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
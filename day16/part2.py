@@ -1,13 +1,15 @@
-import argparse
 import functools
 import itertools
 import os.path
 import re
 
-import networkx as nx
 import pytest
 
-from support import timing
+from support.cli import part_main
+from support.graph import all_pairs
+from support.graph import CSRGraph
+from support.spans import count
+from support.spans import span
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -28,22 +30,30 @@ EXPECTED = 1707
 
 
 def make_graph(s):
-    G = nx.DiGraph()
+    tunnels = []
     flow_rates = {}
     for line in s.strip().splitlines():
         this, *others = re.findall(r'[A-Z]{2}', line)
         this_flow_rate = int(re.findall(r'\d+', line)[0])
         flow_rates[this] = this_flow_rate
         for o in others:
-            G.add_edge(this, o)
-    for node, data in G.nodes(data=True):
-        data['flow_rate'] = flow_rates[node]
+            tunnels.append((this, o))
 
-    return G
+    return CSRGraph.from_pairs(tunnels), flow_rates
 
 
-def released_value(G, valve_solution):
-    return sum(G.nodes[valve]['flow_rate'] * time for valve, time in valve_solution.items())
+def valve_distances(graph, valves):
+    """{a: {b: minutes from a to b}} between the given valves only."""
+    dist = all_pairs(graph).tolist()
+    ids = graph.node_ids
+    return {
+        a: {b: int(dist[ids[a]][ids[b]]) for b in valves}
+        for a in valves
+    }
+
+
+def released_value(flow_rates, valve_solution):
+    return sum(flow_rates[valve] * time for valve, time in valve_solution.items())
 
 
 def get_valve_times(distances, valves: set, time_remaining, current_node='AA', valve_to_time=None):
@@ -61,28 +71,32 @@ def get_valve_times(distances, valves: set, time_remaining, current_node='AA', v
 
 
 def compute(s: str) -> int:
-    G = make_graph(s)
+    graph, flow_rates = make_graph(s)
 
-    nonzero_valves = set(node for node, rate in G.nodes(data='flow_rate') if rate)
-    all_distances = nx.floyd_warshall(G)
+    nonzero_valves = set(node for node, rate in flow_rates.items() if rate)
+    all_distances = valve_distances(graph, nonzero_valves | {'AA'})
 
     # find all bruteforce solutions
-    get_released = functools.partial(released_value, G)  # pre-apply the graph
+    get_released = functools.partial(released_value, flow_rates)  # pre-apply the rates
 
     # two workers traverse the graph, each opening different valves
     # calculate all possible 26 time paths
     scores = {}
-    for path in get_valve_times(all_distances, nonzero_valves, current_node='AA', time_remaining=26):
-        score = get_released(path)
-        path = frozenset(path)
-        scores[path] = max(scores.get(path, 0), score)
+    with span('paths'):
+        for path in get_valve_times(all_distances, nonzero_valves, current_node='AA', time_remaining=26):
+            score = get_released(path)
+            path = frozenset(path)
+            scores[path] = max(scores.get(path, 0), score)
+        count('distinct valve sets', len(scores))
 
     # find the max score of two distinct paths
     max_score = 0
-    for (path_1, score_1), (path_2, score_2) in itertools.combinations(scores.items(), 2):
-        if path_1.intersection(path_2):
-            continue
-        max_score = max(max_score, score_1 + score_2)
+    with span('pairs'):
+        for (path_1, score_1), (path_2, score_2) in itertools.combinations(scores.items(), 2):
+            if path_1.intersection(path_2):
+                continue
+            max_score = max(max_score, score_1 + score_2)
+        count('pairs checked', len(scores) * (len(scores) - 1) // 2)
 
     return max_score
 
@@ -99,14 +113,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
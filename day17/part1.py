@@ -1,4 +1,3 @@
-import argparse
 import itertools
 import os.path
 import textwrap
@@ -6,10 +5,13 @@ from copy import deepcopy
 from dataclasses import dataclass
 from typing import ClassVar
 
+import numpy as np
 import pytest
 
 from support import Direction4
-from support import timing
+from support import Grid
+from support.cli import part_main
+from support.sparse import SparseGrid
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -84,14 +86,16 @@ class Chamber:
     def __init__(self, jets: str, rocks: list[Rock]):
         self.jets = itertools.cycle(jets)
         self.rocks = itertools.cycle(rocks)
-        self.occupied: set[Coord] = set()
+        self.occupied = SparseGrid()
         self.rock = None
 
     @property
     def max_height(self):
         if not self.occupied:
             return 0
-        return max(c[1] for c in self.occupied)
+        # y is the high field of the packed keys, the max key is the highest
+        _, y = self.occupied.codec.decode(max(self.occupied.packed))
+        return y
 
     def collision(self, rock: Rock):
         in_wall = any(c[0] in [0, 8] for c in rock)
@@ -132,21 +136,22 @@ class Chamber:
                 self.occupied |= self.rock.shape
                 break
 
-    def _coord_to_char(self, c):
-        if c in self.occupied:
-            return '#'
-        if self.rock and c in self.rock:
-            return '@'
-        return '.'
+    def to_grid(self) -> Grid:
+        """Rows 1 to max_height + 8: 0 empty, 1 rock at rest, 2 falling."""
+        grid = Grid.zeros((1, 1), (7, self.max_height + 8), dtype=np.uint8)
+        for value, coords in ((1, self.occupied), (2, self.rock or ())):
+            for coord in coords:
+                if coord in grid:
+                    grid[coord] = value
+        return grid
 
     def __str__(self):
-        print_height = self.max_height + 8
-        rows = []
-        for y in range(print_height, 0, -1):
-            row = str(y) + ' |' + ''.join(self._coord_to_char((x, y)) for x in range(1, 8)) + '|'
-            rows.append(row)
-        rows.append('0 +-------+')
-        return '\n'.join(rows)
+        # the grid grows downwards, the chamber upwards
+        rows = reversed(self.to_grid().format('.#@').splitlines())
+        ys = itertools.count(self.max_height + 8, -1)
+        ret = [f'{y} |{row}|' for y, row in zip(ys, rows)]
+        ret.append('0 +-------+')
+        return '\n'.join(ret)
 
 
 def compute(s: str) -> int:
@@ -176,14 +181,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
@@ -1,4 +1,3 @@
-import argparse
 import itertools
 import os.path
 import textwrap
@@ -6,10 +5,15 @@ from copy import deepcopy
 from dataclasses import dataclass
 from typing import ClassVar
 
+import numpy as np
 import pytest
 
 from support import Direction4
-from support import timing
+from support import Grid
+from support.cli import part_main
+from support.sparse import SparseGrid
+from support.spans import count
+from support.spans import traced
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -84,7 +88,7 @@ class Chamber:
     def __init__(self, jets: str, rocks: list[Rock]):
         self.jets = itertools.cycle(enumerate(jets))
         self.rocks = itertools.cycle(enumerate(rocks))
-        self.occupied: set[Coord] = set((x, 0) for x in range(8))
+        self.occupied = SparseGrid((x, 0) for x in range(8))
         self.rock = None
 
         self.signature_to_height = {}
@@ -93,8 +97,11 @@ class Chamber:
     def max_height(self):
         if not self.occupied:
             return 0
-        return max(c[1] for c in self.occupied)
+        # y is the high field of the packed keys, the max key is the highest
+        _, y = self.occupied.codec.decode(max(self.occupied.packed))
+        return y
 
+    @traced()
     def collision(self, rock: Rock):
         in_wall = any(c[0] in [0, 8] for c in rock)
         on_the_floor = any(c[1] == 0 for c in rock)
@@ -107,15 +114,24 @@ class Chamber:
         rock.move(Direction4.RIGHT, n=3)
         self.rock = rock
 
+    @traced()
     def _get_relief(self):
         """get the top relief signature"""
-        max_ys = [
-            max(y for x, y in self.occupied if x == i)
-            for i in range(1, 8)
+        codec = self.occupied.codec
+        keys = self.occupied.packed
+        mask = codec.mask
+        # the x field of a key is x + offset
+        max_keys = [
+            max(k for k in keys if k & mask == field)
+            for field in range(codec.offset + 1, codec.offset + 8)
         ]
-        min_y = min(max_ys)
-        return frozenset((x, y - min_y) for x, y in self.occupied if y >= min_y)
+        _, min_y = codec.decode(min(max_keys))
+        # packed keys shifted down by min_y, compared as plain ints
+        lowest = codec.encode((codec.min_coord, min_y))
+        shift = codec.delta((0, min_y))
+        return frozenset(k - shift for k in keys if k >= lowest)
 
+    @traced()
     def process_rock(self, current_rock):
         """Repeat following.
 
@@ -132,6 +148,7 @@ class Chamber:
         self.spawn_rock(rock)
         while True:
             jet_id, arrow = next(self.jets)
+            count('jets')
 
             # if we saw this pattern before
             relief = self._get_relief()
@@ -169,20 +186,18 @@ class Chamber:
                 self.occupied |= self.rock.shape
                 break
 
-    def _coord_to_char(self, c):
-        if c in self.occupied:
-            return '█'
-        if self.rock and c in self.rock:
-            return '@'
-        return ' '
+    def to_grid(self) -> Grid:
+        """Rows 1 to max_height + 8: 0 empty, 1 rock at rest, 2 falling."""
+        grid = Grid.zeros((1, 1), (7, self.max_height + 8), dtype=np.uint8)
+        for value, coords in ((1, self.occupied), (2, self.rock or ())):
+            for coord in coords:
+                if coord in grid:
+                    grid[coord] = value
+        return grid
 
     def _str_state(self):
-        print_height = self.max_height + 8
-        rows = []
-        for y in range(print_height, 0, -1):
-            row = ''.join(self._coord_to_char((x, y)) for x in range(1, 8))
-            rows.append(row)
-        return rows
+        # the grid grows downwards, the chamber upwards
+        return self.to_grid().format(' █@').splitlines()[::-1]
 
     def __str__(self):
         rows = [f'│{row}│' for row in self._str_state()]
@@ -190,7 +205,7 @@ class Chamber:
         rows.append('└───────┘')
         return '\n'.join(
             f'{i:>4} {row}'
-            for i, row, number in zip(nums, rows)
+            for i, row in zip(nums, rows)
         )
 
 
@@ -221,14 +236,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
@@ -1,10 +1,13 @@
-import argparse
 import os.path
-from collections import deque
 
+import numpy as np
 import pytest
 
-from support import timing
+from support import memory_mapped
+from support.cli import part_main
+from support.grid import adjacent_6_batch
+from support.inputs import MappedInput
+from support.parse import int_array
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -32,34 +35,31 @@ INPUT_S_2 = '''\
 EXPECTED_2 = 64
 
 
-def in_bounds(cube, bounds):
-    return all(
-        bound[0] <= coord <= bound[1]
-        for coord, bound in zip(cube, bounds)
-    )
-
-
-def compute(s: str) -> int:
-    cubes = set()
-    faces = 0
-    for line in s.splitlines():
-        x, y, z = map(int, line.split(','))
-        candidates = (
-        (x + 1, y, z),
-        (x - 1, y, z),
-        (x, y + 1, z),
-        (x, y - 1, z),
-        (x, y, z + 1),
-        (x, y, z - 1),
-        )
-        faces += 6  # assume free standing
-        for c in candidates:
-            if c in cubes:
-                # if adjacent, remove two faces
-                faces -= 2
-            cubes.add((x, y, z))
-
-    return faces
+def parse_cubes(s: str | MappedInput) -> np.ndarray:
+    return int_array(s).rows(3)
+
+
+def solid_box(cubes: np.ndarray) -> np.ndarray:
+    """Boolean box around the cubes with one free layer on every side.
+
+    The cube at ``(x, y, z)`` is at ``box[x - min_x + 1, ...]``, use
+    ``cubes - cubes.min(axis=0) + 1`` as coordinates into the box.
+    """
+    cubes = cubes - cubes.min(axis=0) + 1
+    box = np.zeros(cubes.max(axis=0) + 2, dtype=bool)
+    box[tuple(cubes.T)] = True
+    return box
+
+
+@memory_mapped
+def compute(s: str | MappedInput) -> int:
+    cubes = parse_cubes(s)
+    box = solid_box(cubes)
+
+    # every face touching another cube is hidden
+    _, adjacent = adjacent_6_batch(cubes - cubes.min(axis=0) + 1)
+    hidden = int(box[tuple(adjacent.T)].sum())
+    return 6 * len(cubes) - hidden
 
 
 # @pytest.mark.solved
@@ -76,14 +76,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
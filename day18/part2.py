@@ -1,10 +1,13 @@
-import argparse
 import os.path
-from collections import deque
 
+import numpy as np
 import pytest
 
-from support import timing
+from support import memory_mapped
+from support.cli import part_main
+from support.grid import adjacent_6_batch
+from support.inputs import MappedInput
+from support.parse import int_array
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -27,60 +30,43 @@ INPUT_S = '''\
 EXPECTED = 58
 
 
-def in_bounds(cube, bounds):
-    return all(
-        bound[0] <= coord <= bound[1]
-        for coord, bound in zip(cube, bounds)
-    )
+def parse_cubes(s: str | MappedInput) -> np.ndarray:
+    return int_array(s).rows(3)
 
 
-def compute(s: str) -> int:
-    cubes = set(
-        tuple(map(int, line.split(',')))
-        for line in s.splitlines()
-    )
+def solid_box(cubes: np.ndarray) -> np.ndarray:
+    """Boolean box around the cubes with one free layer on every side.
 
-    # consider the envelope around the cubes to be one larger
-    min_max = lambda x: (min(x) - 1, max(x) + 1)
-    # (min_x, max_x), (min_y, max_y), (min_z, max_z)
-    bounds = tuple(map(min_max, zip(*cubes)))
+    The cube at ``(x, y, z)`` is at ``box[x - min_x + 1, ...]``, use
+    ``cubes - cubes.min(axis=0) + 1`` as coordinates into the box.
+    """
+    cubes = cubes - cubes.min(axis=0) + 1
+    box = np.zeros(cubes.max(axis=0) + 2, dtype=bool)
+    box[tuple(cubes.T)] = True
+    return box
 
-    start = tuple(coord[0] for coord in bounds)
+
+@memory_mapped
+def compute(s: str | MappedInput) -> int:
+    box = solid_box(parse_cubes(s))
+    bounds = ((0, 0, 0), np.array(box.shape) - 1)
     total_sides = 0
 
-    # BFS
-    seen = set()
-    queue = deque((start,))
-    while queue:
-        # Pop the first current from the queue
-        current = queue.popleft()
-
-        if current in seen:
-            continue
-
-        # Mark the current as seen
-        seen.add(current)
-
-        # Get all the neighbors of the current
-        x, y, z = current
-        candidates = (
-            (x + 1, y, z),
-            (x - 1, y, z),
-            (x, y + 1, z),
-            (x, y - 1, z),
-            (x, y, z + 1),
-            (x, y, z - 1),
-        )
-        for candidate in candidates:
-            if candidate in seen:
-                continue
-            if candidate in cubes:
-                total_sides += 1
-                continue
-            if not in_bounds(candidate, bounds):
-                continue
-
-            queue.append(candidate)
+    # BFS through the air around the cubes, a whole frontier at a time,
+    # starting from a corner of the free layer around them
+    seen = np.zeros_like(box)
+    seen[0, 0, 0] = True
+    frontier = np.zeros((1, 3), dtype=np.int64)
+    while len(frontier):
+        _, candidates = adjacent_6_batch(frontier, bounds)
+        is_cube = box[tuple(candidates.T)]
+        # every air cell is visited once, so is every face of the envelope
+        total_sides += int(is_cube.sum())
+
+        candidates = candidates[~is_cube]
+        candidates = candidates[~seen[tuple(candidates.T)]]
+        frontier = np.unique(candidates, axis=0)
+        seen[tuple(frontier.T)] = True
 
     return total_sides
 
@@ -98,14 +84,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
@@ -1,10 +1,12 @@
-import argparse
 import os.path
 from dataclasses import dataclass
 
 import pytest
 
-from support import timing
+from support import memory_mapped
+from support.cli import part_main
+from support.inputs import MappedInput
+from support.parse import int_array
 
 INPUT_TXT = os.path.join(os.path.dirname(__file__), 'input.txt')
 
@@ -90,9 +92,10 @@ def get_shift(n, l):
     return n % (l - 1) if n else 0
 
 
-def compute(s: str) -> int:
+@memory_mapped
+def compute(s: str | MappedInput) -> int:
     # load into dictionary
-    nums = [int(n) for n in s.splitlines()]
+    nums = int_array(s).values.tolist()
     num_len = len(nums)
     head, node_zero = create_circular_linked_list(nums)
     orig_nodes = list(yield_circular_linked_list(head))
@@ -122,14 +125,7 @@ def test(input_s: str, expected: int) -> None:
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument('data_file', nargs='?', default=INPUT_TXT)
-    args = parser.parse_args()
-
-    with open(args.data_file) as f, timing():
-        print(compute(f.read()))
-
-    return 0
+    return part_main(compute, INPUT_TXT)
 
 
 if __name__ == '__main__':
@@ -5,48 +5,40 @@ import enum
 import os
 import re
 import shutil
-import sys
 import time
-import urllib.error
-import urllib.request
 from itertools import zip_longest
 from pathlib import Path
+from typing import Any
+from typing import Callable
 from typing import Generator
+from typing import Iterable
+from typing import TYPE_CHECKING
+from typing import TypeVar
 
-import networkx as nx
-from matplotlib import pyplot as plt
+from support import events
+from support.inputs import aoc_backend
+from support.inputs import get_input  # noqa: F401 (public api)
+from support.inputs import InputStore
 
-HERE = os.path.dirname(os.path.abspath(__file__))
-ENV_FILE = os.path.join(HERE, '../../.env')
+if TYPE_CHECKING:
+    from support.grid import Grid
 
 
 @contextlib.contextmanager
-def timing(name: str = '') -> Generator[None, None, None]:
-    before = time.time()
+def timing(
+        name: str = '',
+        phase: str | None = None,
+) -> Generator[None, None, None]:
+    """Time the block and emit a ``support.events.TimingEvent``.
+
+    By default the event is printed as ``> 1.2 ms (phase name)``.
+    """
+    before = time.perf_counter_ns()
     try:
         yield
     finally:
-        after = time.time()
-        t = (after - before) * 1000
-        unit = 'ms'
-        if t < 100:
-            t *= 1000
-            unit = 'μs'
-        if name:
-            name = f' ({name})'
-        print(f'> {int(t)} {unit}{name}', file=sys.stderr, flush=True)
-
-
-def _get_cookie_headers() -> dict[str, str]:
-    with open(ENV_FILE) as f:
-        contents = f.read().strip()
-    return {'Cookie': contents}
-
-
-def get_input(year: int, day: int) -> str:
-    url = f'https://adventofcode.com/{year}/day/{day}/input'
-    req = urllib.request.Request(url, headers=_get_cookie_headers())
-    return urllib.request.urlopen(req).read().decode()
+        ns = time.perf_counter_ns() - before
+        events.emit(events.TimingEvent(name, ns, phase=phase))
 
 
 def get_year_day() -> tuple[int, int]:
@@ -63,16 +55,12 @@ def get_year_day() -> tuple[int, int]:
 def download_input() -> int:
     year, day = get_year_day()
 
-    for i in range(5):
-        try:
-            s = get_input(year, day)
-        except urllib.error.URLError as e:
-            print(f'zzz: not ready yet: {e}')
-            time.sleep(1)
-        else:
-            break
-    else:
-        raise SystemExit('timed out after attempting many times')
+    # only the first download of a day goes to the network
+    store = InputStore(backend=aoc_backend())
+    try:
+        s = store.text(year, day)
+    except TimeoutError as e:
+        raise SystemExit(str(e))
 
     with open('input.txt', 'w') as f:
         f.write(s)
@@ -113,15 +101,14 @@ def new_day() -> None:
     print(f"Creating folder '{new_day_folder_name}'.")
     shutil.copytree(temp_dir, new_path)
 
-    # replace template mark with commented solved
-    old = r'@pytest.mark.template'
-    new = r'# @pytest.mark.solved'
-    pattern = re.compile(old)
+    # replace template mark with commented solved, fill in the day
     with open(new_path / 'part1.py', 'r+') as f:
         contents = f.read()
-        contents = pattern.sub(new, contents)
+        contents = contents.replace('@pytest.mark.template', '# @pytest.mark.solved')
+        contents = re.sub(r'^DAY = 0$', f'DAY = {new_day_num}', contents, flags=re.M)
         f.seek(0)
         f.write(contents)
+        f.truncate()
 
     # edit run configurations
     print('Editing run configuration.')
@@ -156,6 +143,37 @@ def grouper(iterable, n, *, incomplete='fill', fillvalue=None):
         raise ValueError('Expected fill, strict, or ignore')
 
 
+def iter_lines(s: str | Iterable[str]) -> Iterable[str]:
+    """Lines of a puzzle input given either as a string or as lines."""
+    if isinstance(s, str):
+        return s.splitlines()
+    return s
+
+
+TCallable = TypeVar('TCallable', bound=Callable[..., Any])
+
+
+def streaming(compute: TCallable) -> TCallable:
+    """Mark ``compute`` as accepting an iterable of lines instead of a str.
+
+    The part cli and the runner then feed it lines straight from a memory
+    mapped input file instead of reading the whole file first.
+    """
+    compute.streaming = True  # type: ignore[attr-defined]
+    return compute
+
+
+def memory_mapped(compute: TCallable) -> TCallable:
+    """Mark ``compute`` as accepting a ``MappedInput`` instead of a str.
+
+    The part cli and the runner then hand it the memory mapped input file
+    itself, for bulk parsers that work on the raw bytes (``view``) without
+    a copy or that spread the file over worker processes (``path``).
+    """
+    compute.memory_mapped = True  # type: ignore[attr-defined]
+    return compute
+
+
 def adjacent_4(x: int, y: int) -> Generator[tuple[int, int], None, None]:
     yield x, y - 1
     yield x + 1, y
@@ -171,17 +189,17 @@ def adjacent_8(x: int, y: int) -> Generator[tuple[int, int], None, None]:
             yield x + x_d, y + y_d
 
 
-def parse_coords_int(s: str) -> dict[tuple[int, int], int]:
+def parse_coords_int(s: str | Iterable[str]) -> dict[tuple[int, int], int]:
     coords = {}
-    for y, line in enumerate(s.splitlines()):
+    for y, line in enumerate(iter_lines(s)):
         for x, c in enumerate(line):
             coords[(x, y)] = int(c)
     return coords
 
 
-def parse_coords_hash(s: str) -> set[tuple[int, int]]:
+def parse_coords_hash(s: str | Iterable[str]) -> set[tuple[int, int]]:
     coords = set()
-    for y, line in enumerate(s.splitlines()):
+    for y, line in enumerate(iter_lines(s)):
         for x, c in enumerate(line):
             if c == '#':
                 coords.add((x, y))
@@ -189,11 +207,13 @@ def parse_coords_hash(s: str) -> set[tuple[int, int]]:
 
 
 def parse_numbers_split(s: str) -> list[int]:
-    return [int(x) for x in s.split()]
+    """Whitespace separated numbers, for big inputs see ``parse.int_array``."""
+    return list(map(int, s.split()))
 
 
 def parse_numbers_comma(s: str) -> list[int]:
-    return [int(x) for x in s.strip().split(',')]
+    """Comma separated numbers, for big inputs see ``parse.int_array``."""
+    return list(map(int, s.strip().split(',')))
 
 
 def format_coords_hash(coords: set[tuple[int, int]]) -> str:
@@ -232,33 +252,48 @@ class Direction4(enum.Enum):
     DOWN = (0, 1)
     LEFT = (-1, 0)
 
+    # plain attributes filled in below the class, looking them up allocates
+    # nothing (they used to rebuild the member tuple on every access)
+    cw: Direction4
+    ccw: Direction4
+    opposite: Direction4
+
     def __init__(self, x: int, y: int) -> None:
         self.x, self.y = x, y
 
-    @property
-    def _vals(self) -> tuple[Direction4, ...]:
-        return tuple(type(self).__members__.values())
+    def apply(self, x: int, y: int, *, n: int = 1) -> tuple[int, int]:
+        return self.x * n + x, self.y * n + y
 
-    @property
-    def cw(self) -> Direction4:
-        vals = self._vals
-        return vals[(vals.index(self) + 1) % len(vals)]
+    def apply_many(self, coords: Any, *, n: int = 1) -> Any:
+        """``apply`` to an ``(N, 2)`` array of coordinates at once."""
+        import numpy as np  # only for the days already using numpy
 
-    @property
-    def ccw(self) -> Direction4:
-        vals = self._vals
-        return vals[(vals.index(self) - 1) % len(vals)]
+        return np.asarray(coords) + (self.x * n, self.y * n)
 
-    @property
-    def opposite(self) -> Direction4:
-        vals = self._vals
-        return vals[(vals.index(self) + 2) % len(vals)]
 
-    def apply(self, x: int, y: int, *, n: int = 1) -> tuple[int, int]:
-        return self.x * n + x, self.y * n + y
+def _link_directions(directions: Iterable[Direction4]) -> None:
+    vals = tuple(directions)
+    for i, direction in enumerate(vals):
+        direction.cw = vals[(i + 1) % len(vals)]
+        direction.ccw = vals[(i - 1) % len(vals)]
+        direction.opposite = vals[(i + 2) % len(vals)]
+
+
+_link_directions(Direction4)
+
+# the same deltas as plain tuples, for loops too hot for attribute lookups
+DELTA_UP = Direction4.UP.value
+DELTA_RIGHT = Direction4.RIGHT.value
+DELTA_DOWN = Direction4.DOWN.value
+DELTA_LEFT = Direction4.LEFT.value
+DELTAS_4 = (DELTA_UP, DELTA_RIGHT, DELTA_DOWN, DELTA_LEFT)
 
 
 def show_graph(G):
+    # imported here, these take longer to import than most days take to run
+    import networkx as nx
+    from matplotlib import pyplot as plt
+
     nx.draw(G, with_labels=True, font_weight='bold')
     plt.show()
 
@@ -276,3 +311,12 @@ class Colour(enum.Enum):
 
     def apply(self, string: str):
         return self.value + string + self.RESET.value
+
+
+def __getattr__(name: str) -> Any:
+    # numpy takes longer to import than most days take to run, only load
+    # it for the days using a Grid
+    if name == 'Grid':
+        from support.grid import Grid
+        return Grid
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
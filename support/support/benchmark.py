@@ -0,0 +1,367 @@
+"""Repeated, high resolution timing of a ``compute`` callable.
+
+``support.timing`` takes one sample, which is fine for a quick look but
+too noisy to spot regressions in the fast parts.  ``benchmark`` warms the
+callable up, calibrates how many calls fit into one round and then
+collects ``perf_counter_ns`` samples over many rounds.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+from typing import Callable
+from typing import Sequence
+
+from support import events
+from support.generators import generate
+from support.generators import GENERATORS
+from support.generators import SIZES
+from support.memory import format_bytes
+from support.memory import memory
+from support.runner import discover_parts
+from support.runner import format_ns
+from support.runner import import_part
+from support.runner import read_input
+
+JSON_VERSION = 1
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    iterations: int  # calls per round
+    samples_ns: list[float] = field(repr=False)  # mean call time per round
+    result: Any = None
+
+    @property
+    def rounds(self) -> int:
+        return len(self.samples_ns)
+
+    @property
+    def min(self) -> float:
+        return min(self.samples_ns)
+
+    @property
+    def max(self) -> float:
+        return max(self.samples_ns)
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples_ns)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples_ns)
+
+    @property
+    def p95(self) -> float:
+        if self.rounds < 2:
+            return self.max
+        return statistics.quantiles(self.samples_ns, n=20)[-1]
+
+    @property
+    def stddev(self) -> float:
+        if self.rounds < 2:
+            return 0.0
+        return statistics.stdev(self.samples_ns)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'name': self.name,
+            'rounds': self.rounds,
+            'iterations': self.iterations,
+            'min_ns': self.min,
+            'median_ns': self.median,
+            'p95_ns': self.p95,
+            'mean_ns': self.mean,
+            'stddev_ns': self.stddev,
+            'max_ns': self.max,
+            'samples_ns': self.samples_ns,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> BenchmarkResult:
+        return cls(d['name'], d['iterations'], d['samples_ns'])
+
+    def __str__(self) -> str:
+        return (
+            f'{self.name}: median {format_ns(int(self.median))} '
+            f'(min {format_ns(int(self.min))}, '
+            f'p95 {format_ns(int(self.p95))}, '
+            f'stddev {format_ns(int(self.stddev))}, '
+            f'{self.rounds} x {self.iterations})'
+        )
+
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    warmup_ns: int = 50_000_000
+    round_ns: int = 10_000_000  # calibrate iterations to fill one round
+    rounds: int = 25
+    max_ns: int = 5_000_000_000  # stop early for the really slow parts
+    min_rounds: int = 3
+
+
+def _time_calls(func: Callable[..., Any], args: tuple[Any, ...], n: int) -> int:
+    before = time.perf_counter_ns()
+    for _ in range(n):
+        func(*args)
+    return time.perf_counter_ns() - before
+
+
+def calibrate(
+        func: Callable[..., Any],
+        *args: Any,
+        round_ns: int = BenchmarkConfig.round_ns,
+) -> int:
+    """Return how many calls it takes for one round to last ``round_ns``."""
+    n = 1
+    while True:
+        elapsed = _time_calls(func, args, n)
+        if elapsed >= round_ns:
+            return n
+        # aim straight for the target, at most 10x per step
+        n = max(n + 1, min(n * 10, int(n * round_ns / max(elapsed, 1))))
+
+
+def benchmark(
+        func: Callable[..., Any],
+        *args: Any,
+        name: str = '',
+        config: BenchmarkConfig = BenchmarkConfig(),
+) -> BenchmarkResult:
+    name = name or getattr(func, '__qualname__', repr(func))
+    # the timing events of thousands of calls would only flood stderr
+    with events.sinks(replace=True):
+        start = time.perf_counter_ns()
+
+        # warmup: at least one call, keep its result for the report
+        result = func(*args)
+        while time.perf_counter_ns() - start < config.warmup_ns:
+            func(*args)
+
+        iterations = calibrate(func, *args, round_ns=config.round_ns)
+
+        samples = []
+        deadline = time.perf_counter_ns() + config.max_ns
+        while len(samples) < config.rounds:
+            samples.append(_time_calls(func, args, iterations) / iterations)
+            if len(samples) >= config.min_rounds and time.perf_counter_ns() > deadline:
+                break
+
+    return BenchmarkResult(name, iterations, samples, result)
+
+
+def assert_faster(
+        slow: Callable[..., Any],
+        fast: Callable[..., Any],
+        *args: Any,
+        config: BenchmarkConfig = BenchmarkConfig(),
+        check: Callable[[Any, Any], Any] | None = None,
+) -> float:
+    """Benchmark ``slow`` and ``fast`` on ``args``, return the speedup.
+
+    Fails unless both return the same result (by ``==`` or by ``check``,
+    e.g. ``np.testing.assert_array_equal``) and ``fast`` has the lower
+    median, the shared body of the ``bench_*.py`` before / after checks.
+    """
+    slow_result = benchmark(slow, *args, config=config)
+    fast_result = benchmark(fast, *args, config=config)
+    if check is not None:
+        check(slow_result.result, fast_result.result)
+    else:
+        assert slow_result.result == fast_result.result
+
+    speedup = slow_result.median / fast_result.median
+    print(f'\n{slow_result}\n{fast_result}\n{speedup:.1f}x faster')
+    assert speedup > 1, (
+        f'{fast_result.name} {format_ns(int(fast_result.median))} is not '
+        f'faster than {slow_result.name} {format_ns(int(slow_result.median))}'
+    )
+    return speedup
+
+
+@dataclass
+class ScalingPoint:
+    name: str
+    size: int
+    input_bytes: int
+    median_ns: float = 0.0
+    peak_bytes: int = 0
+    error: str | None = None
+
+    def __str__(self) -> str:
+        if self.error:
+            return f'{self.name} size={self.size}: ERROR {self.error}'
+        return (
+            f'{self.name} size={self.size} ({self.input_bytes} B): '
+            f'median {format_ns(int(self.median_ns))}, '
+            f'peak {format_bytes(self.peak_bytes)}'
+        )
+
+
+# generated inputs get big quickly, a couple of calls per size is enough
+SCALING_CONFIG = BenchmarkConfig(warmup_ns=0, round_ns=0, rounds=3, max_ns=0)
+
+
+def scaling(
+        func: Callable[[str], Any],
+        day: int,
+        sizes: list[int],
+        *,
+        name: str = '',
+        seed: int = 0,
+        config: BenchmarkConfig = SCALING_CONFIG,
+) -> list[ScalingPoint]:
+    """Time and memory of ``func`` on generated inputs of growing size."""
+    name = name or getattr(func, '__qualname__', repr(func))
+    points = []
+    for size in sizes:
+        s = generate(day, size, seed)
+        point = ScalingPoint(name, size, len(s.encode()))
+        try:
+            point.median_ns = benchmark(func, s, name=name, config=config).median
+            # separate call, tracing slows everything down considerably
+            with memory(report=False) as report, events.sinks(replace=True):
+                func(s)
+            point.peak_bytes = report.peak_traced
+        except Exception as e:
+            point.error = f'{type(e).__name__}: {e}'
+        points.append(point)
+    return points
+
+
+def results_to_json(
+        results: list[BenchmarkResult],
+        scaling: Sequence[ScalingPoint] = (),
+) -> dict[str, Any]:
+    ret = {
+        'version': JSON_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'results': [r.as_dict() for r in results],
+    }
+    if scaling:
+        ret['scaling'] = [asdict(point) for point in scaling]
+    return ret
+
+
+def write_json(
+        results: list[BenchmarkResult],
+        path: str | os.PathLike[str],
+        scaling: Sequence[ScalingPoint] = (),
+) -> None:
+    with open(path, 'w') as f:
+        json.dump(results_to_json(results, scaling), f, indent=2)
+        f.write('\n')
+
+
+def read_json(path: str | os.PathLike[str]) -> list[BenchmarkResult]:
+    with open(path) as f:
+        contents = json.load(f)
+    if contents.get('version') != JSON_VERSION:
+        raise ValueError(f'unsupported benchmark file version in {path}')
+    return [BenchmarkResult.from_dict(d) for d in contents['results']]
+
+
+class Baselines:
+    """Stored benchmark results to compare new runs against, keyed by name."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = path
+        try:
+            self.results = {r.name: r for r in read_json(path)}
+        except FileNotFoundError:
+            self.results = {}
+
+    def get(self, name: str) -> BenchmarkResult | None:
+        return self.results.get(name)
+
+    def ratio(self, result: BenchmarkResult) -> float | None:
+        """Median of ``result`` relative to its baseline median."""
+        baseline = self.get(result.name)
+        if baseline is None:
+            return None
+        return result.median / baseline.median
+
+    def update(self, result: BenchmarkResult) -> None:
+        self.results[result.name] = result
+
+    def save(self) -> None:
+        write_json(sorted(self.results.values(), key=lambda r: r.name), self.path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='benchmark dayNN/partN.py compute functions',
+    )
+    parser.add_argument('days', nargs='*', type=int, help='only these days')
+    parser.add_argument('--root', default='.', help='calendar root folder')
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument(
+        '--rounds', type=int, default=BenchmarkConfig.rounds,
+        help='number of timed rounds per part',
+    )
+    parser.add_argument(
+        '--scale', type=int, nargs='*', metavar='SIZE',
+        help=(
+            'benchmark generated inputs of these sizes instead '
+            "(default: the part's BENCH_SIZES, else its generator's sizes)"
+        ),
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = BenchmarkConfig(rounds=args.rounds)
+    results = []
+    points: list[ScalingPoint] = []
+    for part in discover_parts(args.root, set(args.days)):
+        module = import_part(part)
+        if args.scale is not None and part.day not in GENERATORS:
+            print(
+                f'{part.name}: no input generator, nothing to scale',
+                file=sys.stderr,
+            )
+            continue
+        with contextlib.redirect_stdout(io.StringIO()):
+            if args.scale is not None:
+                sizes = args.scale or getattr(
+                    module, 'BENCH_SIZES', SIZES[part.day],
+                )
+                part_points = scaling(
+                    module.compute, part.day, list(sizes),
+                    name=part.name, seed=args.seed,
+                )
+            else:
+                s, _ = read_input(part, module)
+                result = benchmark(module.compute, s, name=part.name, config=config)
+
+        if args.scale is not None:
+            for point in part_points:
+                print(point, file=sys.stderr, flush=True)
+            points.extend(part_points)
+        else:
+            print(result, file=sys.stderr, flush=True)
+            results.append(result)
+
+    if args.json:
+        write_json(results, args.json, points)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,176 @@
+"""On disk cache of ``compute`` results.
+
+An entry is keyed by the sha256 of the input together with the sha256 of
+the sources of the part: ``partN.py``, the calendar modules it imports
+(recursively) and the whole ``support`` package.  Editing a solution, a
+helper it imports or its input invalidates it.  Entries live next to the
+input cache, every hit refreshes the entry's mtime and the least
+recently used ones are evicted once the cache grows beyond
+``max_bytes``.
+"""
+from __future__ import annotations
+
+import ast
+import contextlib
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from typing import Callable
+
+from support.inputs import default_root
+
+MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class CachedResult:
+    result: Any
+    output: str = ''  # whatever compute printed, replayed on a hit
+
+
+def input_digest(data: str | bytes | os.PathLike[str]) -> str:
+    """sha256 of an input given as text, bytes or the path of a file."""
+    if isinstance(data, str):
+        data = data.encode()
+    if isinstance(data, bytes):
+        return hashlib.sha256(data).hexdigest()
+    with open(data, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+SUPPORT_DIR = Path(__file__).resolve().parent
+
+
+def _imported_names(path: Path) -> set[str]:
+    """Every module ``path`` imports, ``from a import b`` also gives ``a.b``."""
+    names = set()
+    for node in ast.walk(ast.parse(path.read_bytes(), str(path))):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+            names.update(f'{node.module}.{alias.name}' for alias in node.names)
+    return names
+
+
+def _module_files(name: str, roots: list[Path]) -> list[Path]:
+    """The files of ``name`` and its packages below one of ``roots``."""
+    *packages, module = name.split('.')
+    for root in roots:
+        files = []
+        folder = root
+        for package in packages:
+            folder = folder / package
+            files.append(folder / '__init__.py')
+        candidates = (folder / f'{module}.py', folder / module / '__init__.py')
+        found = [c for c in candidates if c.is_file()]
+        if found and all(f.is_file() for f in files):
+            return [*files, found[0]]
+    return []
+
+
+def source_files(path: str | os.PathLike[str]) -> list[Path]:
+    """``path``, the local modules it imports (recursively) and ``support``.
+
+    Local means found next to ``path`` or in the folder above it, where
+    the ``dayNN`` packages live, stdlib and site-packages are left out.
+    """
+    path = Path(path).resolve()
+    roots = [path.parent, path.parent.parent]
+    seen = {path}
+    todo = [path]
+    while todo:
+        for name in _imported_names(todo.pop()):
+            if name.split('.')[0] == 'support':
+                continue  # all of it is added below
+            for file in _module_files(name, roots):
+                if file not in seen:
+                    seen.add(file)
+                    todo.append(file)
+    return sorted(seen) + sorted(SUPPORT_DIR.glob('*.py'))
+
+
+def part_digest(path: str | os.PathLike[str]) -> str:
+    """sha256 of the ``source_files`` of the part at ``path``."""
+    sha = hashlib.sha256()
+    for source in source_files(path):
+        sha.update(f'{source.name}:{input_digest(source)}\n'.encode())
+    return sha.hexdigest()
+
+
+def source_digest(compute: Callable[..., Any]) -> str:
+    """sha256 of the sources ``compute`` depends on, see ``source_files``."""
+    source_file = inspect.getsourcefile(compute)
+    if source_file is None:
+        raise ValueError(f'no source file for {compute!r}')
+    return part_digest(source_file)
+
+
+class ResultCache:
+    def __init__(
+            self,
+            root: str | os.PathLike[str] | None = None,
+            max_bytes: int = MAX_BYTES,
+    ) -> None:
+        self.root = Path(root) if root is not None else default_root() / 'results'
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(input_sha: str, source_sha: str) -> str:
+        return hashlib.sha256(f'{input_sha}:{source_sha}'.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f'{key}.pickle'
+
+    def get(self, key: str) -> CachedResult | None:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                ret = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (
+                EOFError, pickle.UnpicklingError, AttributeError, ImportError,
+        ):
+            # truncated, or pickled a class that was renamed or moved since
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+            return None
+        os.utime(path)  # mark as recently used
+        return ret
+
+    def put(self, key: str, value: CachedResult) -> None:
+        try:
+            data = pickle.dumps(value)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return  # some results (e.g. lambdas) can't be cached, fine
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop least recently used entries until under ``max_bytes``."""
+        entries = []
+        for path in self.root.glob('*.pickle'):
+            with contextlib.suppress(FileNotFoundError):
+                st = path.stat()
+                entries.append((st.st_mtime_ns, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+            total -= size
+
+    def clear(self) -> None:
+        for path in self.root.glob('*.pickle'):
+            path.unlink()
@@ -0,0 +1,163 @@
+"""The command line every ``partN.py`` shares.
+
+    def main() -> int:
+        return part_main(compute, INPUT_TXT)
+
+``python partN.py [data_file]`` prints the answer and its timing (a
+``@streaming`` compute gets the lines of the memory mapped file, a
+``@memory_mapped`` one the ``MappedInput`` itself),
+``--repeat N`` times ``compute`` N times and ``--profile [TOP]`` runs it
+under cProfile, prints the TOP functions by cumulative time and dumps
+the stats for ``python -m pstats`` / snakeviz.  A single plain run
+replays the cached result when neither the part, the modules it imports
+(``support`` included) nor its input changed since the last run,
+``--no-cache`` always runs ``compute``.  ``--events FILE`` also appends
+the timing events (see ``support.events``) to FILE and ``--spans``
+prints the tree of ``support.spans`` of every run.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import cProfile
+import io
+import os.path
+import re
+import sys
+from typing import Any
+from typing import Callable
+from typing import Sequence
+
+from support import events
+from support import timing
+from support.cache import CachedResult
+from support.cache import input_digest
+from support.cache import ResultCache
+from support.cache import source_digest
+from support.events import JsonlSink
+from support.inputs import open_input
+from support.spans import format_tree
+from support.spans import recording
+
+
+def _default_pstats(compute: Callable[..., Any]) -> str:
+    module = sys.modules.get(compute.__module__)
+    filename = getattr(module, '__file__', None) or 'compute.py'
+    return os.path.splitext(os.path.basename(filename))[0] + '.pstats'
+
+
+def _positive_int(s: str) -> int:
+    try:
+        n = int(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expected an integer, got {s!r}')
+    if n < 1:
+        raise argparse.ArgumentTypeError(f'expected at least 1, got {n}')
+    return n
+
+
+def _part_labels(compute: Callable[..., Any]) -> tuple[int | None, int | None]:
+    """Day and part of ``compute``, from its ``dayNN/partN.py`` file."""
+    module = sys.modules.get(compute.__module__)
+    filename = getattr(module, '__file__', None) or ''
+    match = re.search(r'day(\d+)[/\\]part(\d+)\.py$', filename)
+    return (int(match[1]), int(match[2])) if match else (None, None)
+
+
+def part_main(
+        compute: Callable[[str], Any],
+        input_txt: str,
+        argv: Sequence[str] | None = None,
+) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('data_file', nargs='?', default=input_txt)
+    parser.add_argument(
+        '--repeat', type=_positive_int, default=1, metavar='N',
+        help='run compute N times, timing each run',
+    )
+    parser.add_argument(
+        '--profile', nargs='?', type=int, const=25, default=None, metavar='TOP',
+        help='profile with cProfile and print the TOP (default 25) functions',
+    )
+    parser.add_argument(
+        '--profile-out', metavar='FILE',
+        help='where to dump the profile stats (default: partN.pstats)',
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='always run compute, ignoring cached results',
+    )
+    parser.add_argument(
+        '--events', metavar='FILE',
+        help='also append the timing events to FILE (jsonl)',
+    )
+    parser.add_argument(
+        '--spans', action='store_true',
+        help='record the support.spans of compute and print their tree',
+    )
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as ctx:
+        ctx.enter_context(events.labels(*_part_labels(compute)))
+        if args.events is not None:
+            ctx.enter_context(events.sinks(JsonlSink(args.events)))
+        # repeating, profiling or spans only make sense when actually running
+        if (
+                not args.no_cache and args.repeat == 1 and
+                args.profile is None and not args.spans
+        ):
+            return _cached_main(compute, args.data_file)
+        return _run_main(compute, args)
+
+
+def _run_main(compute: Callable[..., Any], args: argparse.Namespace) -> int:
+    with contextlib.ExitStack() as ctx:
+        get_input = open_input(compute, args.data_file, ctx)
+
+        profiler = cProfile.Profile() if args.profile is not None else None
+        for i in range(args.repeat):
+            name = f'{i + 1}/{args.repeat}' if args.repeat > 1 else ''
+            s_or_lines = get_input()
+            record = recording() if args.spans else contextlib.nullcontext()
+            with record as spans, timing(name, phase='compute'):
+                if profiler:
+                    profiler.enable()
+                result = compute(s_or_lines)
+                if profiler:
+                    profiler.disable()
+            if spans is not None:
+                print(format_tree(spans), file=sys.stderr)
+    print(result)
+
+    if profiler:
+        out = args.profile_out or _default_pstats(compute)
+        profiler.dump_stats(out)
+        import pstats  # slow to import, only needed here
+
+        stats = pstats.Stats(profiler, stream=sys.stderr)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(args.profile)
+        print(f'> profile written to {out}', file=sys.stderr)
+
+    return 0
+
+
+def _cached_main(compute: Callable[..., Any], data_file: str) -> int:
+    cache = ResultCache()
+    key = cache.key(input_digest(data_file), source_digest(compute))
+    cached = cache.get(key)
+    if cached is not None:
+        print(cached.output, end='')
+        print(cached.result)
+        print('> cached', file=sys.stderr)
+        return 0
+
+    with contextlib.ExitStack() as ctx:
+        s = open_input(compute, data_file, ctx)()
+        # keep what compute prints so a cache hit can show it again
+        output = io.StringIO()
+        with timing(phase='compute'), contextlib.redirect_stdout(output):
+            result = compute(s)
+    print(output.getvalue(), end='')
+    print(result)
+    cache.put(key, CachedResult(result, output.getvalue()))
+    return 0
@@ -0,0 +1,176 @@
+"""Structured timing events, what ``support.timing`` measures.
+
+Every ``timing`` block emits a ``TimingEvent`` to the current sinks, by
+default a ``StderrSink`` printing ``> 1.2 ms (parse)``.  ``compute`` can
+split itself into phases::
+
+    with timing(phase='parse'):
+        grid = parse(s)
+    with timing(phase='solve'):
+        ...
+
+The runner tags the events with the day and part and collects them from
+every worker, ``run-all --events FILE`` appends them to a JSONL file and
+``run-all --phases`` prints the time per phase of every part.
+
+>>> with collect() as events:
+...     emit(TimingEvent('', 1_500, phase='parse'))
+>>> events.events[0].phase, format_ns(events.events[0].ns)
+('parse', '2 μs')
+"""
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import json
+import os
+import sys
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Generator
+from typing import Iterable
+
+
+def format_ns(ns: int) -> str:
+    if ns < 1_000_000:
+        return f'{ns / 1_000:.0f} μs'
+    if ns < 1_000_000_000:
+        return f'{ns / 1_000_000:.1f} ms'
+    return f'{ns / 1_000_000_000:.2f} s'
+
+
+@dataclass(frozen=True)
+class TimingEvent:
+    name: str
+    ns: int
+    day: int | None = None
+    part: int | None = None
+    phase: str | None = None
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, s: str) -> TimingEvent:
+        return cls(**json.loads(s))
+
+
+Sink = Callable[[TimingEvent], None]
+
+
+class StderrSink:
+    """The classic ``> 1.2 ms (name)`` line per event."""
+
+    def __call__(self, event: TimingEvent) -> None:
+        label = ' '.join(filter(None, (event.phase, event.name)))
+        label = f' ({label})' if label else ''
+        print(f'> {format_ns(event.ns)}{label}', file=sys.stderr, flush=True)
+
+
+class JsonlSink:
+    """Appends one json object per event to ``path``.
+
+    The file is opened per event, so several processes can share it.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = path
+
+    def __call__(self, event: TimingEvent) -> None:
+        with open(self.path, 'a') as f:
+            f.write(f'{event.to_json()}\n')
+
+
+class Collector:
+    """Keeps the events in memory, see ``collect``."""
+
+    def __init__(self) -> None:
+        self.events: list[TimingEvent] = []
+
+    def __call__(self, event: TimingEvent) -> None:
+        self.events.append(event)
+
+
+_sinks: list[Sink] = [StderrSink()]
+_labels: dict[str, Any] = {}
+
+
+def emit(event: TimingEvent) -> None:
+    """Send ``event`` to every sink, tagged with the current labels."""
+    if _labels:
+        event = dataclasses.replace(event, **_labels)
+    for sink in _sinks:
+        sink(event)
+
+
+@contextlib.contextmanager
+def sinks(*new: Sink, replace: bool = False) -> Generator[None, None, None]:
+    """Also send the events to ``new`` (only to them with ``replace``)."""
+    before = _sinks[:]
+    _sinks[:] = [*(() if replace else before), *new]
+    try:
+        yield
+    finally:
+        _sinks[:] = before
+
+
+@contextlib.contextmanager
+def collect(replace: bool = True) -> Generator[Collector, None, None]:
+    """Keep the events of the block (by default instead of printing them)."""
+    collector = Collector()
+    with sinks(collector, replace=replace):
+        yield collector
+
+
+@contextlib.contextmanager
+def labels(
+        day: int | None = None,
+        part: int | None = None,
+) -> Generator[None, None, None]:
+    """Tag the events of the block with ``day`` and ``part``."""
+    before = dict(_labels)
+    _labels.update({'day': day, 'part': part})
+    try:
+        yield
+    finally:
+        _labels.clear()
+        _labels.update(before)
+
+
+def phase_summary(events: Iterable[TimingEvent]) -> str:
+    """Table of the time spent per phase, one row per part.
+
+    Events without a phase are left out, a part timing the same phase
+    more than once gets the sum.
+    """
+    totals: dict[tuple[int | None, int | None], dict[str, int]] = {}
+    phases: dict[str, None] = {}  # in order of appearance
+    for event in events:
+        if event.phase is None:
+            continue
+        phases[event.phase] = None
+        by_phase = totals.setdefault((event.day, event.part), {})
+        by_phase[event.phase] = by_phase.get(event.phase, 0) + event.ns
+    if not totals:
+        return 'no phases timed'
+
+    all_phases: dict[str, int] = {}
+    rows = [('part', *phases)]
+    for (day, part), by_phase in sorted(
+            totals.items(), key=lambda kv: (kv[0][0] or 0, kv[0][1] or 0),
+    ):
+        rows.append((
+            f'day{day:02}/part{part}' if day is not None else '-',
+            *(format_ns(by_phase[p]) if p in by_phase else '' for p in phases),
+        ))
+        for p, ns in by_phase.items():
+            all_phases[p] = all_phases.get(p, 0) + ns
+    rows.append(('all', *(format_ns(all_phases[p]) for p in phases)))
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return '\n'.join(
+        '  '.join(col.ljust(w) for col, w in zip(row, widths)).rstrip()
+        for row in rows
+    )
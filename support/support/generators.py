@@ -0,0 +1,378 @@
+"""Seeded, size parameterized puzzle inputs for stress testing ``compute``.
+
+Every generator takes ``size`` (the natural unit of its puzzle, e.g. the
+number of lines, elves or cubes) and a ``random.Random`` and returns the
+puzzle input as a string in the exact format of the real input.  Its
+registration also names the sizes ``benchmark --scale`` runs by default,
+a part overrides them with its own ``BENCH_SIZES``.
+
+>>> generate(2, 3, seed=1)
+'A Z\\nA Y\\nA Y\\n'
+"""
+from __future__ import annotations
+
+import itertools
+import random
+import string
+from typing import Callable
+
+Generator = Callable[[int, random.Random], str]
+
+GENERATORS: dict[int, Generator] = {}
+SIZES: dict[int, tuple[int, ...]] = {}
+
+
+def register(
+        day: int,
+        sizes: tuple[int, ...] = (1_000, 10_000, 100_000),
+) -> Callable[[Generator], Generator]:
+    def register_decorator(func: Generator) -> Generator:
+        GENERATORS[day] = func
+        SIZES[day] = sizes
+        return func
+    return register_decorator
+
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    try:
+        func = GENERATORS[day]
+    except KeyError:
+        raise KeyError(f'no input generator for day {day}') from None
+    return func(size, random.Random(seed))
+
+
+@register(1)
+def calories(size: int, rng: random.Random) -> str:
+    """``size`` elves, each carrying 1-10 food items."""
+    return '\n\n'.join(
+        '\n'.join(
+            str(rng.randint(1_000, 60_000))
+            for _ in range(rng.randint(1, 10))
+        )
+        for _ in range(size)
+    ) + '\n'
+
+
+@register(2)
+def strategy_guide(size: int, rng: random.Random) -> str:
+    """``size`` rounds of rock paper scissors."""
+    return ''.join(
+        f'{rng.choice("ABC")} {rng.choice("XYZ")}\n'
+        for _ in range(size)
+    )
+
+
+@register(3)
+def rucksacks(size: int, rng: random.Random) -> str:
+    """``size`` rucksacks (rounded up to whole groups of three).
+
+    Both compartments share exactly one item and every group of three
+    shares exactly one badge, like the real input.
+    """
+    lines = []
+    for _ in range(-(-size // 3)):
+        letters = list(string.ascii_letters)
+        rng.shuffle(letters)
+        badge, rest = letters[0], letters[1:]
+        for elf in range(3):
+            # every elf of the group draws from its own letters
+            common, *pool = rest[elf::3]
+            first_pool, second_pool = pool[::2], pool[1::2]
+            half = rng.randint(4, 16)
+            first = [badge, common] + rng.choices(first_pool, k=half - 2)
+            second = [common] + rng.choices(second_pool, k=half - 1)
+            rng.shuffle(first)
+            rng.shuffle(second)
+            lines.append(''.join(first + second))
+    return '\n'.join(lines) + '\n'
+
+
+@register(4)
+def section_pairs(size: int, rng: random.Random) -> str:
+    """``size`` pairs of section assignments."""
+    lines = []
+    for _ in range(size):
+        a, b = sorted(rng.randint(1, 99) for _ in range(2))
+        x, y = sorted(rng.randint(1, 99) for _ in range(2))
+        lines.append(f'{a}-{b},{x}-{y}')
+    return '\n'.join(lines) + '\n'
+
+
+@register(5)
+def crate_moves(size: int, rng: random.Random) -> str:
+    """Nine stacks of crates and ``size`` valid move instructions.
+
+    Moves never empty a stack, so every stack has a top crate at the end.
+    """
+    stacks = [
+        [rng.choice(string.ascii_uppercase) for _ in range(rng.randint(2, 8))]
+        for _ in range(9)
+    ]
+
+    height = max(map(len, stacks))
+    drawing = [
+        ' '.join(
+            f'[{stack[level]}]' if level < len(stack) else '   '
+            for stack in stacks
+        )
+        for level in reversed(range(height))
+    ]
+    drawing.append(' '.join(f' {i} ' for i in range(1, 10)))
+
+    moves = []
+    for _ in range(size):
+        src = rng.choice([i for i, stack in enumerate(stacks) if len(stack) > 1])
+        dst = rng.choice([i for i in range(9) if i != src])
+        amount = rng.randint(1, len(stacks[src]) - 1)
+        moved = stacks[src][-amount:]
+        del stacks[src][-amount:]
+        stacks[dst].extend(moved)
+        moves.append(f'move {amount} from {src + 1} to {dst + 1}')
+
+    return '\n'.join(drawing) + '\n\n' + '\n'.join(moves) + '\n'
+
+
+@register(6)
+def datastream(size: int, rng: random.Random) -> str:
+    """``size`` characters where the first 14 unique ones are at the end."""
+    body = rng.choices('abc', k=max(size - 14, 0))
+    marker = rng.sample(string.ascii_lowercase[3:], 14)
+    return ''.join(body + marker) + '\n'
+
+
+@register(7)
+def terminal_session(size: int, rng: random.Random) -> str:
+    """Browse a random tree of ``size`` files, at most 10 levels deep."""
+    lines = []
+    remaining = size
+    names = itertools.count()
+
+    def visit(depth: int) -> None:
+        nonlocal remaining
+        n_files = min(remaining, rng.randint(1, 8))
+        remaining -= n_files
+        n_dirs = rng.randint(1, 4) if depth < 10 and remaining else 0
+        dirs = [f'd{next(names)}' for _ in range(n_dirs)]
+
+        lines.append('$ ls')
+        lines.extend(f'dir {name}' for name in dirs)
+        lines.extend(
+            f'{rng.randint(1, 300_000)} f{next(names)}.{rng.choice(("txt", "dat"))}'
+            for _ in range(n_files)
+        )
+        for name in dirs:
+            lines.append(f'$ cd {name}')
+            visit(depth + 1)
+            lines.append('$ cd ..')
+
+    while remaining:
+        # a new top level directory whenever the previous ran out of depth
+        lines.append('$ cd /')
+        visit(0)
+    return '\n'.join(lines) + '\n'
+
+
+@register(8, sizes=(10, 100, 1_000))
+def tree_grid(size: int, rng: random.Random) -> str:
+    """``size`` x ``size`` grid of tree heights."""
+    return ''.join(
+        ''.join(rng.choices(string.digits, k=size)) + '\n'
+        for _ in range(size)
+    )
+
+
+@register(9, sizes=(100, 1_000, 3_000))
+def rope_moves(size: int, rng: random.Random) -> str:
+    """``size`` head moves of 1-20 steps."""
+    return ''.join(
+        f'{rng.choice("RULD")} {rng.randint(1, 20)}\n'
+        for _ in range(size)
+    )
+
+
+@register(10)
+def cpu_program(size: int, rng: random.Random) -> str:
+    """``size`` instructions.
+
+    Part 2 draws a fixed 240 pixel screen, keep ``size`` <= 120 for it.
+    """
+    return ''.join(
+        'noop\n' if rng.random() < 0.3 else f'addx {rng.randint(-20, 20)}\n'
+        for _ in range(size)
+    )
+
+
+@register(11, sizes=(10, 100, 1_000))
+def monkeys(size: int, rng: random.Random) -> str:
+    """Eight monkeys holding ``size`` items between them."""
+    n = 8  # the solutions parse single digit monkey names
+    divisors = rng.sample((2, 3, 5, 7, 11, 13, 17, 19, 23), n)
+    items: list[list[int]] = [[] for _ in range(n)]
+    for _ in range(size):
+        items[rng.randrange(n)].append(rng.randint(50, 99))
+
+    # only one monkey squares and nobody throws to it, otherwise the worry
+    # levels of part 1 grow beyond any reasonable size
+    square = rng.randrange(n)
+    blocks = []
+    for i in range(n):
+        if i == square:
+            op = 'old * old'
+        elif rng.random() < 0.5:
+            op = f'old * {rng.randint(2, 19)}'
+        else:
+            op = f'old + {rng.randint(1, 8)}'
+        targets = [m for m in range(n) if m not in (i, square)]
+        true_monkey, false_monkey = rng.sample(targets, 2)
+        blocks.append(
+            f'Monkey {i}:\n'
+            f'  Starting items: {", ".join(map(str, items[i]))}\n'
+            f'  Operation: new = {op}\n'
+            f'  Test: divisible by {divisors[i]}\n'
+            f'    If true: throw to monkey {true_monkey}\n'
+            f'    If false: throw to monkey {false_monkey}\n'
+        )
+    return '\n'.join(blocks)
+
+
+@register(12, sizes=(10, 100, 1_000))
+def heightmap(size: int, rng: random.Random) -> str:
+    """``size`` rows of a heightmap rising from ``a`` (west) to ``z`` (east).
+
+    Random pits only ever go down, the row of ``S`` has none, so ``E`` is
+    always reachable.
+    """
+    width = max(size, 26)
+    start_y = rng.randrange(size)
+    rows = []
+    for y in range(size):
+        row = []
+        for x in range(width):
+            height = x * 26 // width
+            if y != start_y and rng.random() < 0.2:
+                height = rng.randint(0, height)
+            row.append(chr(ord('a') + height))
+        rows.append(row)
+    rows[start_y][0] = 'S'
+    rows[start_y][-1] = 'E'
+    return ''.join(''.join(row) + '\n' for row in rows)
+
+
+def _packet(rng: random.Random, depth: int = 0) -> str:
+    items = []
+    for _ in range(rng.randint(0, 4)):
+        if depth < 4 and rng.random() < 0.3:
+            items.append(_packet(rng, depth + 1))
+        else:
+            items.append(str(rng.randint(0, 10)))
+    return f'[{",".join(items)}]'
+
+
+@register(13, sizes=(100, 1_000, 10_000))
+def packet_pairs(size: int, rng: random.Random) -> str:
+    """``size`` pairs of nested packets."""
+    return '\n'.join(
+        f'{_packet(rng)}\n{_packet(rng)}\n'
+        for _ in range(size)
+    )
+
+
+@register(14, sizes=(10, 30, 100))
+def rock_paths(size: int, rng: random.Random) -> str:
+    """``size`` rock paths below the sand source at 500,0.
+
+    Horizontal segments are shorter than their depth, so piles of sand
+    can not grow back up to the source.
+    """
+    lines = []
+    for _ in range(size):
+        y = rng.randint(10, 180)
+        x = rng.randint(500 - y, 500 + y)
+        points = [(x, y)]
+        for i in range(rng.randint(1, 4)):
+            if i % 2 == 0:
+                x += rng.choice((-1, 1)) * rng.randint(1, max(y // 4, 1))
+            else:
+                y = min(y + rng.randint(1, 10), 190)
+            points.append((x, y))
+        lines.append(' -> '.join(f'{px},{py}' for px, py in points))
+    return '\n'.join(lines) + '\n'
+
+
+@register(15, sizes=(10, 30, 100))
+def sensors(size: int, rng: random.Random) -> str:
+    """``size`` sensors spread over the 4_000_000 x 4_000_000 square."""
+    lines = []
+    for _ in range(size):
+        s_x, s_y = rng.randint(0, 4_000_000), rng.randint(0, 4_000_000)
+        b_x = s_x + rng.randint(-500_000, 500_000)
+        b_y = s_y + rng.randint(-500_000, 500_000)
+        lines.append(
+            f'Sensor at x={s_x}, y={s_y}: '
+            f'closest beacon is at x={b_x}, y={b_y}'
+        )
+    return '\n'.join(lines) + '\n'
+
+
+@register(16, sizes=(5, 10, 20))
+def valves(size: int, rng: random.Random) -> str:
+    """``size`` connected valves (at most 676), about a quarter with flow.
+
+    Part 2 is exponential in the number of valves with flow, keep
+    ``size`` small there.
+    """
+    names = ['AA'] + rng.sample(
+        [
+            a + b
+            for a in string.ascii_uppercase
+            for b in string.ascii_uppercase
+            if a + b != 'AA'
+        ],
+        min(size, 676) - 1,
+    )
+    tunnels: dict[str, set[str]] = {name: set() for name in names}
+    # random spanning tree keeps everything reachable from AA
+    for i, name in enumerate(names[1:], start=1):
+        other = names[rng.randrange(i)]
+        tunnels[name].add(other)
+        tunnels[other].add(name)
+    for _ in range(len(names) // 2):
+        a, b = rng.sample(names, 2)
+        tunnels[a].add(b)
+        tunnels[b].add(a)
+
+    lines = []
+    for name in names:
+        rate = rng.randint(1, 25) if name != 'AA' and rng.random() < 0.25 else 0
+        others = sorted(tunnels[name])
+        if len(others) == 1:
+            lead = f'tunnel leads to valve {others[0]}'
+        else:
+            lead = f'tunnels lead to valves {", ".join(others)}'
+        lines.append(f'Valve {name} has flow rate={rate}; {lead}')
+    return '\n'.join(lines) + '\n'
+
+
+@register(17, sizes=(10, 100, 1_000))
+def jets(size: int, rng: random.Random) -> str:
+    """``size`` jet pushes."""
+    return ''.join(rng.choices('<>', k=size)) + '\n'
+
+
+@register(18)
+def cubes(size: int, rng: random.Random) -> str:
+    """``size`` distinct cubes packed in a box about twice their volume."""
+    side = max(round((2 * size) ** (1 / 3)), 2)
+    coords = rng.sample(range(side ** 3), min(size, side ** 3))
+    return ''.join(
+        f'{c // side // side},{c // side % side},{c % side}\n'
+        for c in coords
+    )
+
+
+@register(20, sizes=(100, 1_000, 3_000))
+def mixing_list(size: int, rng: random.Random) -> str:
+    """``size`` (at least 2) numbers with exactly one zero, never the first."""
+    nums = [rng.choice((-1, 1)) * rng.randint(1, 10_000) for _ in range(size)]
+    nums[rng.randint(1, size - 1)] = 0
+    return ''.join(f'{n}\n' for n in nums)
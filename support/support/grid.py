@@ -0,0 +1,272 @@
+"""Dense 2D grid on a numpy array, the compact cousin of the coord dicts.
+
+``parse_coords_int`` builds a dict of ``(x, y)`` tuples, over 100 bytes and
+a tuple hash per cell.  A ``Grid`` keeps one contiguous array and the
+whole-grid operations (neighbour shifts, comparisons, counting) run in
+numpy instead of python loops.  The ``adjacent_*_batch`` kernels do the
+same for whole batches of (2D or 3D) coordinates, e.g. a BFS frontier.
+
+>>> grid = Grid.parse_int('123\\n456\\n')
+>>> grid[2, 1]
+6
+>>> int(grid.adjacent_4(fill=0)[1].sum())  # the right neighbours
+16
+>>> src, points = adjacent_4_batch([(0, 0)], bounds=((0, 0), (2, 1)))
+>>> points.tolist()
+[[1, 0], [0, 1]]
+"""
+from __future__ import annotations
+
+import itertools
+from typing import Any
+from typing import Iterable
+from typing import Mapping
+
+import numpy as np
+
+from support import iter_lines
+
+Coord = tuple[int, int]
+
+# same order as support.adjacent_4 / support.adjacent_8
+OFFSETS_4: tuple[Coord, ...] = ((0, -1), (1, 0), (0, 1), (-1, 0))
+OFFSETS_8: tuple[Coord, ...] = tuple(
+    (x_d, y_d)
+    for y_d in (-1, 0, 1)
+    for x_d in (-1, 0, 1)
+    if not y_d == x_d == 0
+)
+OFFSETS_6: tuple[tuple[int, int, int], ...] = (
+    (1, 0, 0), (-1, 0, 0),
+    (0, 1, 0), (0, -1, 0),
+    (0, 0, 1), (0, 0, -1),
+)
+OFFSETS_26: tuple[tuple[int, int, int], ...] = tuple(
+    d for d in itertools.product((-1, 0, 1), repeat=3) if any(d)
+)
+
+
+def neighbours(
+        coords: Any,
+        offsets: Iterable[tuple[int, ...]],
+        bounds: tuple[Any, Any] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Every neighbour of an ``(N, D)`` batch of integer coordinates.
+
+    Returns ``(src, points)``, ``points[i]`` is the neighbour of
+    ``coords[src[i]]``.  With ``bounds=(min_coord, max_coord)`` only the
+    points within (inclusive) are kept.
+    """
+    coords = np.asarray(coords, dtype=np.int64)
+    deltas = np.asarray(tuple(offsets), dtype=np.int64)
+    points = (coords[:, None, :] + deltas[None, :, :]).reshape(-1, coords.shape[1])
+    src = np.repeat(np.arange(len(coords)), len(deltas))
+    if bounds is not None:
+        min_coord, max_coord = bounds
+        mask = ((points >= min_coord) & (points <= max_coord)).all(axis=1)
+        src, points = src[mask], points[mask]
+    return src, points
+
+
+def adjacent_4_batch(
+        coords: Any,
+        bounds: tuple[Any, Any] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    return neighbours(coords, OFFSETS_4, bounds)
+
+
+def adjacent_8_batch(
+        coords: Any,
+        bounds: tuple[Any, Any] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    return neighbours(coords, OFFSETS_8, bounds)
+
+
+def adjacent_6_batch(
+        coords: Any,
+        bounds: tuple[Any, Any] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Face neighbours in 3D."""
+    return neighbours(coords, OFFSETS_6, bounds)
+
+
+def adjacent_26_batch(
+        coords: Any,
+        bounds: tuple[Any, Any] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Face, edge and corner neighbours in 3D."""
+    return neighbours(coords, OFFSETS_26, bounds)
+
+
+class Grid:
+    """Cells ``(x, y)`` of ``min <= x, y <= max``, indexed like the dicts.
+
+    ``data[row, col]`` is the cell ``(origin_x + col, origin_y + row)``, the
+    origin lets a grid start anywhere (negative coordinates included).
+    Cells outside the bounds raise ``KeyError``, like a missing dict key.
+    """
+
+    __slots__ = ('data', 'origin')
+
+    def __init__(self, data: np.ndarray, origin: Coord = (0, 0)) -> None:
+        if data.ndim != 2:
+            raise ValueError(f'expected a 2D array, got shape {data.shape}')
+        self.data = data
+        self.origin = origin
+
+    @classmethod
+    def zeros(
+            cls,
+            min_coord: Coord,
+            max_coord: Coord,
+            dtype: Any = bool,
+    ) -> Grid:
+        """Empty grid covering ``min_coord`` to ``max_coord`` (inclusive)."""
+        (min_x, min_y), (max_x, max_y) = min_coord, max_coord
+        shape = (max_y - min_y + 1, max_x - min_x + 1)
+        return cls(np.zeros(shape, dtype=dtype), (min_x, min_y))
+
+    @classmethod
+    def from_chars(cls, s: str | Iterable[str]) -> Grid:
+        """The raw ascii codes of a rectangular block of text."""
+        lines = list(iter_lines(s))
+        if len({len(line) for line in lines}) > 1:
+            raise ValueError('lines of different lengths')
+        data = np.frombuffer(''.join(lines).encode('ascii'), dtype=np.uint8)
+        return cls(data.reshape(len(lines), -1).copy())
+
+    @classmethod
+    def parse_int(cls, s: str | Iterable[str]) -> Grid:
+        """Single digit cells, the ``parse_coords_int`` counterpart."""
+        grid = cls.from_chars(s)
+        grid.data -= ord('0')
+        return grid
+
+    @classmethod
+    def parse_hash(cls, s: str | Iterable[str]) -> Grid:
+        """``True`` for ``#`` cells, the ``parse_coords_hash`` counterpart."""
+        grid = cls.from_chars(s)
+        return cls(grid.data == ord('#'))
+
+    @classmethod
+    def from_coords(
+            cls,
+            coords: Iterable[Coord] | Mapping[Coord, Any],
+            dtype: Any = None,
+    ) -> Grid:
+        """Smallest grid holding a coord set (``True`` cells) or dict."""
+        if isinstance(coords, Mapping):
+            keys, values = list(coords), list(coords.values())
+        else:
+            keys, values = list(coords), None
+        if not keys:
+            raise ValueError('no coordinates')
+        xs, ys = np.array(keys).T
+        ret = cls.zeros(
+            (int(xs.min()), int(ys.min())),
+            (int(xs.max()), int(ys.max())),
+            dtype=dtype or (bool if values is None else np.asarray(values).dtype),
+        )
+        ox, oy = ret.origin
+        ret.data[ys - oy, xs - ox] = True if values is None else values
+        return ret
+
+    @property
+    def height(self) -> int:
+        return self.data.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.data.shape[1]
+
+    @property
+    def min_coord(self) -> Coord:
+        return self.origin
+
+    @property
+    def max_coord(self) -> Coord:
+        ox, oy = self.origin
+        return ox + self.width - 1, oy + self.height - 1
+
+    def _index(self, coord: Coord) -> Coord:
+        ox, oy = self.origin
+        x, y = coord
+        row, col = y - oy, x - ox
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            raise KeyError(coord)
+        return row, col
+
+    def __contains__(self, coord: Coord) -> bool:
+        try:
+            self._index(coord)
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __getitem__(self, coord: Coord) -> Any:
+        return self.data[self._index(coord)].item()
+
+    def __setitem__(self, coord: Coord, value: Any) -> None:
+        self.data[self._index(coord)] = value
+
+    def get(self, coord: Coord, default: Any = None) -> Any:
+        try:
+            return self[coord]
+        except KeyError:
+            return default
+
+    def coords(self, mask: np.ndarray | None = None) -> list[Coord]:
+        """Coordinates of the truthy cells of ``mask`` (default the grid)."""
+        rows, cols = np.nonzero(self.data if mask is None else mask)
+        ox, oy = self.origin
+        return list(zip((cols + ox).tolist(), (rows + oy).tolist()))
+
+    def to_dict(self) -> dict[Coord, Any]:
+        ox, oy = self.origin
+        return {
+            (ox + col, oy + row): value
+            for row, values in enumerate(self.data.tolist())
+            for col, value in enumerate(values)
+        }
+
+    def shift(self, x_d: int, y_d: int, fill: Any = 0) -> np.ndarray:
+        """Every cell's neighbour at ``(x + x_d, y + y_d)``, ``fill`` outside."""
+        h, w = self.data.shape
+        ret = np.full_like(self.data, fill)
+        if abs(x_d) < w and abs(y_d) < h:
+            ret[max(-y_d, 0):h - max(y_d, 0), max(-x_d, 0):w - max(x_d, 0)] = (
+                self.data[max(y_d, 0):h + min(y_d, 0), max(x_d, 0):w + min(x_d, 0)]
+            )
+        return ret
+
+    def adjacent_4(self, fill: Any = 0) -> np.ndarray:
+        """``(4, height, width)`` stack of the ``shift`` of each direction."""
+        return np.stack([self.shift(x_d, y_d, fill) for x_d, y_d in OFFSETS_4])
+
+    def adjacent_8(self, fill: Any = 0) -> np.ndarray:
+        """``(8, height, width)`` stack of the ``shift`` of each direction."""
+        return np.stack([self.shift(x_d, y_d, fill) for x_d, y_d in OFFSETS_8])
+
+    def format(self, chars: str | None = None) -> str:
+        """One character per cell, ``chars[value]`` if given.
+
+        Defaults to ``' #'`` for boolean grids (like ``format_coords_hash``)
+        and ``str(value)`` otherwise (like ``print_grid``).
+        """
+        if chars is None and self.data.dtype == bool:
+            chars = ' #'
+        if chars is not None:
+            cells = np.array(list(chars))[self.data.astype(np.intp)]
+        else:
+            cells = self.data.astype(str)
+        return '\n'.join(''.join(row) for row in cells.tolist())
+
+    def __str__(self) -> str:
+        return self.format()
+
+    def __repr__(self) -> str:
+        return (
+            f'{type(self).__name__}({self.min_coord} to {self.max_coord}, '
+            f'dtype={self.data.dtype})'
+        )
@@ -0,0 +1,271 @@
+"""Local, content addressed cache of the puzzle inputs.
+
+Inputs are stored once under their sha256 and indexed by (year, day)::
+
+    <root>/objects/<sha256>
+    <root>/index/<year>/<day>   -> contains the sha256
+
+A backend is only asked when an input is not in the cache yet, so
+repeated runs never touch the network.  Any object with a
+``fetch(year, day) -> bytes`` method works as a backend, e.g. a
+``FileBackend`` pointed at a folder of inputs or an ``HttpBackend``
+pointed at a local stand-in server for offline testing.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import mmap
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Protocol
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ENV_FILE = os.path.join(HERE, '../../../.env')
+
+YEAR = 2022
+AOC_URL = 'https://adventofcode.com'
+
+
+def default_root() -> Path:
+    if root := os.environ.get('AOC_CACHE_DIR'):
+        return Path(root)
+    cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(cache_home) / 'aoc'
+
+
+def _get_cookie_headers() -> dict[str, str]:
+    with open(ENV_FILE) as f:
+        contents = f.read().strip()
+    return {'Cookie': contents}
+
+
+class FetchBackend(Protocol):
+    def fetch(self, year: int, day: int) -> bytes: ...
+
+
+class FileBackend:
+    """Inputs from a folder, ``pattern`` is formatted with year and day."""
+
+    def __init__(
+            self,
+            root: str | os.PathLike[str],
+            pattern: str = '{year}/day{day:02}.txt',
+    ) -> None:
+        self.root = Path(root)
+        self.pattern = pattern
+
+    def fetch(self, year: int, day: int) -> bytes:
+        return (self.root / self.pattern.format(year=year, day=day)).read_bytes()
+
+
+class HttpBackend:
+    """``GET {base_url}/{year}/day/{day}/input``, retrying while not ready."""
+
+    def __init__(
+            self,
+            base_url: str,
+            headers: dict[str, str] | None = None,
+            *,
+            attempts: int = 5,
+            delay: float = 1,
+    ) -> None:
+        self.base_url = base_url.rstrip('/')
+        self.headers = headers or {}
+        self.attempts = attempts
+        self.delay = delay
+
+    def fetch(self, year: int, day: int) -> bytes:
+        # http.client and email are slow to import, only needed to download
+        import urllib.error
+        import urllib.request
+
+        url = f'{self.base_url}/{year}/day/{day}/input'
+        req = urllib.request.Request(url, headers=self.headers)
+        for _ in range(self.attempts):
+            try:
+                with urllib.request.urlopen(req) as resp:
+                    return resp.read()
+            except urllib.error.URLError as e:
+                print(f'zzz: not ready yet: {e}')
+                time.sleep(self.delay)
+        raise TimeoutError('timed out after attempting many times')
+
+
+def aoc_backend() -> HttpBackend:
+    return HttpBackend(AOC_URL, _get_cookie_headers())
+
+
+def get_input(year: int, day: int) -> str:
+    return HttpBackend(AOC_URL, _get_cookie_headers(), attempts=1).fetch(year, day).decode()
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class InputStore:
+    def __init__(
+            self,
+            root: str | os.PathLike[str] | None = None,
+            backend: FetchBackend | None = None,
+    ) -> None:
+        self.root = Path(root) if root is not None else default_root()
+        self.backend = backend
+
+    def _index(self, year: int, day: int) -> Path:
+        return self.root / 'index' / str(year) / str(day)
+
+    def _object(self, digest: str) -> Path:
+        return self.root / 'objects' / digest
+
+    def _write(self, path: Path, data: bytes) -> None:
+        # write to a temporary file first, readers never see partial files
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def digest(self, year: int, day: int) -> str | None:
+        try:
+            return self._index(year, day).read_text().strip()
+        except FileNotFoundError:
+            return None
+
+    def put(self, year: int, day: int, data: bytes) -> str:
+        digest = sha256(data)
+        obj = self._object(digest)
+        if not obj.exists():
+            self._write(obj, data)
+        self._write(self._index(year, day), digest.encode())
+        return digest
+
+    def path(self, year: int, day: int) -> Path:
+        """Path of the cached input, fetching it from the backend if needed."""
+        digest = self.digest(year, day)
+        if digest is not None and self._object(digest).exists():
+            return self._object(digest)
+        if self.backend is None:
+            raise FileNotFoundError(f'input {year}/{day} is not in {self.root}')
+        return self._object(self.put(year, day, self.backend.fetch(year, day)))
+
+    def get(self, year: int, day: int) -> bytes:
+        path = self.path(year, day)
+        data = path.read_bytes()
+        if sha256(data) != path.name:
+            raise ValueError(f'corrupted input {year}/{day}: {path}')
+        return data
+
+    def text(self, year: int, day: int) -> str:
+        return self.get(year, day).decode()
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+        digest = self.digest(*key)
+        return digest is not None and self._object(digest).exists()
+
+
+class MappedInput:
+    """Read only memory map of an input file.
+
+    ``lines()`` decodes one line at a time, so a streaming ``compute``
+    never holds the whole input as a ``str``.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size:
+                self._mm: mmap.mmap | None = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ,
+                )
+            else:  # empty files can not be mapped
+                self._mm = None
+
+    def __enter__(self) -> MappedInput:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file, or leave that to the last view still around.
+
+        A zero copy parser (see ``support.parse.int_array``) can keep a
+        view alive, e.g. from the traceback of an exception on its way
+        out, closing must not replace that exception with a BufferError.
+        """
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass  # unmapped once the last exported view is gone
+            self._mm = None
+
+    def __len__(self) -> int:
+        return len(self._mm) if self._mm is not None else 0
+
+    @property
+    def view(self) -> memoryview:
+        """Zero copy view of the raw bytes (release it before closing)."""
+        return memoryview(self._mm if self._mm is not None else b'')
+
+    def chunks(self, chunk_size: int = 1 << 20) -> Iterator[str]:
+        """Decoded text, about ``chunk_size`` bytes at a time.
+
+        Every chunk but the last is cut right after a newline, so no
+        character, line or number is ever split between two chunks.
+        """
+        mm = self._mm
+        if mm is None:
+            return
+        pos, end = 0, len(mm)
+        leftover = b''
+        while pos < end:
+            chunk = leftover + mm[pos:pos + chunk_size]
+            pos += chunk_size
+            cut = chunk.rfind(b'\n') + 1 if pos < end else len(chunk)
+            chunk, leftover = chunk[:cut], chunk[cut:]
+            if chunk:  # a line longer than chunk_size, keep reading
+                yield chunk.decode()
+
+    def lines(self, chunk_size: int = 1 << 20) -> Iterator[str]:
+        """Lines without their line ending, like ``str.splitlines``.
+
+        Decodes ``chunk_size`` bytes at a time, splitting stays in C.
+        """
+        for chunk in self.chunks(chunk_size):
+            yield from chunk.splitlines()
+
+    def text(self) -> str:
+        return self._mm[:].decode() if self._mm is not None else ''
+
+
+def open_input(
+        compute: Callable[..., Any],
+        path: str | os.PathLike[str],
+        ctx: contextlib.ExitStack,
+) -> Callable[[], Any]:
+    """What ``compute`` gets of the input file, a fresh one per call.
+
+    A ``@memory_mapped`` compute gets the ``MappedInput``, a ``@streaming``
+    one its lines and any other the whole text.  The map stays open until
+    ``ctx`` closes.
+    """
+    if getattr(compute, 'memory_mapped', False):
+        mapped = ctx.enter_context(MappedInput(path))
+        return lambda: mapped
+    if getattr(compute, 'streaming', False):
+        return ctx.enter_context(MappedInput(path)).lines
+    with open(path) as f:
+        s = f.read()
+    return lambda: s
@@ -0,0 +1,166 @@
+"""Peak memory of a block of code, the memory counterpart of ``timing``.
+
+    with memory('parse', top=5):
+        compute(s)
+
+prints ``> 12.3 MiB peak, 45.6 MiB rss (parse)`` followed by the five
+allocation sites holding the most memory around the peak.
+"""
+from __future__ import annotations
+
+import contextlib
+import linecache
+import sys
+import threading
+import tracemalloc
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Generator
+
+try:
+    import resource
+except ImportError:  # pragma: no cover (windows)
+    resource = None
+
+
+def format_bytes(n: float) -> str:
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(n) < 1024:
+            return f'{n:.1f} {unit}' if unit != 'B' else f'{n:.0f} {unit}'
+        n /= 1024
+    return f'{n:.1f} GiB'
+
+
+def maxrss_bytes(ru_maxrss: int) -> int:
+    """``ru_maxrss`` of a ``resource.struct_rusage`` in bytes."""
+    # linux reports KiB, macos bytes
+    return ru_maxrss if sys.platform == 'darwin' else ru_maxrss * 1024
+
+
+def peak_rss() -> int:
+    """High water mark of the resident set size of this process, in bytes."""
+    if resource is None:
+        return 0
+    return maxrss_bytes(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+@dataclass
+class AllocationSite:
+    filename: str
+    lineno: int
+    size: int
+    count: int
+
+    def __str__(self) -> str:
+        line = linecache.getline(self.filename, self.lineno).strip()
+        return (
+            f'{format_bytes(self.size):>10} in {self.count:>7} blocks '
+            f'{self.filename}:{self.lineno}  {line}'
+        )
+
+
+@dataclass
+class MemoryReport:
+    peak_traced: int = 0
+    peak_rss: int = 0
+    top: list[AllocationSite] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return (
+            f'{format_bytes(self.peak_traced)} peak, '
+            f'{format_bytes(self.peak_rss)} rss'
+        )
+
+
+class _PeakSampler(threading.Thread):
+    """Snapshot the traced allocations whenever they reach a new high.
+
+    ``tracemalloc`` only remembers the size of the peak, not where the
+    memory came from, and a snapshot taken at the end only shows what
+    survived.  Polling from a thread catches the sites close to the peak.
+    """
+
+    def __init__(self, interval: float, growth: float = 1.1) -> None:
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.growth = growth
+        self.best = 0
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self._stop_event = threading.Event()
+
+    def sample(self) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self.best * self.growth:
+            self.best = current
+            self.snapshot = tracemalloc.take_snapshot()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+        self.sample()
+
+
+def top_sites(snapshot: tracemalloc.Snapshot, n: int) -> list[AllocationSite]:
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, threading.__file__),
+        tracemalloc.Filter(False, contextlib.__file__),
+    ))
+    return [
+        AllocationSite(
+            stat.traceback[0].filename, stat.traceback[0].lineno,
+            stat.size, stat.count,
+        )
+        for stat in snapshot.statistics('lineno')[:n]
+    ]
+
+
+@contextlib.contextmanager
+def memory(
+        name: str = '',
+        *,
+        top: int = 0,
+        interval: float = 0.01,
+        report: bool = True,
+) -> Generator[MemoryReport, None, None]:
+    """Measure peak traced memory (and optionally the top ``top`` sites).
+
+    The yielded report is filled in when the block exits.  Allocation
+    sites are sampled every ``interval`` seconds, blocks shorter than that
+    may report none.  Tracing makes the measured code several times
+    slower, don't combine with ``timing``.
+    """
+    ret = MemoryReport()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    sampler = _PeakSampler(interval) if top else None
+    if sampler:
+        sampler.start()
+    try:
+        yield ret
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        if sampler:
+            sampler.stop()
+            if sampler.snapshot is not None:
+                ret.top = top_sites(sampler.snapshot, top)
+        if not was_tracing:
+            tracemalloc.stop()
+
+        ret.peak_traced = peak - baseline
+        ret.peak_rss = peak_rss()
+        if report:
+            if name:
+                name = f' ({name})'
+            print(f'> {ret}{name}', file=sys.stderr, flush=True)
+            for site in ret.top:
+                print(f'    {site}', file=sys.stderr, flush=True)
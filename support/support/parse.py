@@ -0,0 +1,281 @@
+"""Precompiled parsers for the usual shapes of puzzle input.
+
+    MOVE = Fields('move {} from {} to {}', int, int, int)
+    amount, src, dst = MOVE(line)
+
+    for elf in records(path):  # blank line separated groups of lines
+        ...
+
+    for a, b, x, y in int_rows(s, 4, signed=False):  # 2-4,6-8
+        ...
+
+    numbers = int_array(s)  # every integer of s in one numpy array
+    numbers.record_sums().max()
+
+Build the parsers once at module level, calling them per line then costs
+a single regex match (no pattern cache lookup, no intermediate lists).
+"""
+from __future__ import annotations
+
+import functools
+import itertools
+import os
+import re
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import TYPE_CHECKING
+
+from support import iter_lines
+from support.inputs import MappedInput
+
+if TYPE_CHECKING:
+    import numpy as np
+
+INT_RE = re.compile(r'-?\d+')
+UINT_RE = re.compile(r'\d+')
+
+
+def ints(s: str) -> list[int]:
+    """Every integer in ``s``, a leading ``-`` makes it negative."""
+    return list(map(int, INT_RE.findall(s)))
+
+
+def uints(s: str) -> list[int]:
+    """Every run of digits in ``s``, for inputs like ``2-4,6-8``."""
+    return list(map(int, UINT_RE.findall(s)))
+
+
+def int_rows(
+        source: str | Iterable[str] | os.PathLike[str],
+        n: int,
+        *,
+        signed: bool = True,
+) -> Iterator[tuple[int, ...]]:
+    """The integers of ``source``, ``n`` at a time.
+
+    For inputs with the same count of numbers on every line: one regex
+    scan over the whole text (or over large chunks of a memory mapped
+    file) instead of one per line.
+    """
+    regex = INT_RE if signed else UINT_RE
+    if isinstance(source, os.PathLike):
+        with MappedInput(source) as mapped:
+            yield from int_rows(mapped.chunks(), n, signed=signed)
+        return
+
+    pieces = (source,) if isinstance(source, str) else source
+    nums = map(int, itertools.chain.from_iterable(map(regex.findall, pieces)))
+    yield from zip(*[nums] * n)
+
+
+class Fields:
+    """A fixed line format, ``{}`` marks a field.
+
+    Fields converted with ``int`` only match integers, the others match
+    anything (as little as possible).  Without converters every field is
+    returned as a ``str``.
+    """
+
+    def __init__(self, template: str, *converters: Callable[[str], Any]) -> None:
+        literals = template.split('{}')
+        n_fields = len(literals) - 1
+        if converters and len(converters) != n_fields:
+            raise ValueError(
+                f'{template!r} has {n_fields} fields, '
+                f'got {len(converters)} converters',
+            )
+        self.template = template
+        self.converters = converters or (str,) * n_fields
+        # the common case of one converter for all fields maps in C
+        self._converter = (
+            self.converters[0] if len(set(self.converters)) == 1 else None
+        )
+        pattern = re.escape(literals[0])
+        for converter, literal in zip(self.converters, literals[1:]):
+            pattern += r'(-?\d+)' if converter is int else '(.*?)'
+            pattern += re.escape(literal)
+        self.pattern = re.compile(pattern)
+
+    def __call__(self, line: str) -> tuple[Any, ...]:
+        match = self.pattern.fullmatch(line)
+        if match is None:
+            raise ValueError(f'{line!r} does not match {self.template!r}')
+        if self._converter is not None:
+            return tuple(map(self._converter, match.groups()))
+        return tuple(
+            converter(value)
+            for converter, value in zip(self.converters, match.groups())
+        )
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.template!r})'
+
+
+def records(
+        source: str | Iterable[str] | os.PathLike[str],
+) -> Iterator[list[str]]:
+    """Groups of lines separated by blank lines, lazily.
+
+    ``source`` is the input text, an iterable of lines without line
+    endings (e.g. ``MappedInput.lines()``) or the path of a file, which is
+    memory mapped.  Runs of blank lines never produce empty records.
+    """
+    if isinstance(source, os.PathLike):
+        with MappedInput(source) as mapped:
+            yield from records(mapped.lines())
+        return
+
+    record: list[str] = []
+    for line in iter_lines(source):
+        if line:
+            record.append(line)
+        elif record:
+            yield record
+            record = []
+    if record:
+        yield record
+
+
+# int64 holds every 18 digit number
+_MAX_DIGITS = 18
+
+
+class IntArray:
+    """Every integer of an input in one array, see ``int_array``.
+
+    ``values[line_offsets[i]:line_offsets[i + 1]]`` are the numbers of
+    line ``i`` and ``values[record_offsets[i]:record_offsets[i + 1]]``
+    those of the ``i``-th group of lines between blank lines.  The offsets
+    are only worked out when first used.
+    """
+
+    def __init__(self, values: np.ndarray, buf: np.ndarray, starts: np.ndarray) -> None:
+        self.values = values
+        self._buf = buf
+        self._starts = starts
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @functools.cached_property
+    def _line_ends(self) -> np.ndarray:
+        import numpy as np
+
+        # a newline or the end of an unterminated last line
+        buf = self._buf
+        line_ends = np.flatnonzero(buf == ord('\n'))
+        if len(buf) and buf[-1] != ord('\n'):
+            line_ends = np.append(line_ends, len(buf))
+        return line_ends
+
+    @functools.cached_property
+    def line_offsets(self) -> np.ndarray:
+        import numpy as np
+
+        before = np.searchsorted(self._starts, self._line_ends)
+        return np.concatenate(([0], before)).astype(np.intp)
+
+    @functools.cached_property
+    def record_offsets(self) -> np.ndarray:
+        import numpy as np
+
+        buf, line_ends = self._buf, self._line_ends
+        line_starts = np.concatenate(([0], line_ends[:-1] + 1))[:len(line_ends)]
+        line_lengths = line_ends - line_starts
+        if len(buf):  # a \r\n ending does not make a line non blank
+            line_lengths -= buf[np.maximum(line_ends - 1, 0)] == ord('\r')
+        # records start at a non blank line right after a blank one
+        blank = line_lengths <= 0
+        first = ~blank & np.concatenate(([True], blank[:-1]))
+        return np.concatenate(
+            (self.line_offsets[:-1][first], [len(self.values)]),
+        ).astype(np.intp)
+
+    def line(self, i: int) -> np.ndarray:
+        return self.values[self.line_offsets[i]:self.line_offsets[i + 1]]
+
+    def record(self, i: int) -> np.ndarray:
+        return self.values[self.record_offsets[i]:self.record_offsets[i + 1]]
+
+    def rows(self, n: int) -> np.ndarray:
+        """The values ``n`` per row, for inputs like ``1,2,3``."""
+        return self.values.reshape(-1, n)
+
+    def record_sums(self) -> np.ndarray:
+        """The sum of every record (0 for records without numbers)."""
+        return _segment_sums(self.values, self.record_offsets)
+
+    def line_sums(self) -> np.ndarray:
+        return _segment_sums(self.values, self.line_offsets)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({len(self.values)} values)'
+
+
+def _segment_sums(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    import numpy as np
+
+    sums = np.zeros(len(offsets) - 1, dtype=np.int64)
+    if len(values):
+        # reduceat needs in range starts and gives empty segments a value
+        starts = offsets[:-1]
+        nonempty = starts < offsets[1:]
+        sums[nonempty] = np.add.reduceat(values, starts[nonempty])
+    return sums
+
+
+def int_array(
+        source: str | bytes | memoryview | MappedInput | os.PathLike[str],
+        *,
+        signed: bool = True,
+) -> IntArray:
+    """Every integer of ``source`` as an ``int64`` numpy array.
+
+    Works on the raw bytes with a handful of vectorized passes per digit
+    position instead of building a Python ``int`` per token.  Numbers
+    longer than 18 digits raise ``ValueError``.  A ``MappedInput`` is
+    parsed in place, the ``IntArray`` has to go before the map closes.
+
+    >>> numbers = int_array('1\\n2\\n\\n-3,4\\n')
+    >>> numbers.values.tolist(), numbers.record_sums().tolist()
+    ([1, 2, -3, 4], [3, 1])
+    """
+    import numpy as np
+
+    if isinstance(source, os.PathLike):
+        # the offsets are worked out lazily, so no memory map here
+        source = Path(source).read_bytes()
+    if isinstance(source, MappedInput):
+        # zero copy, the array keeps the map busy until it is dropped
+        source = source.view
+    if isinstance(source, str):
+        source = source.encode()
+
+    buf = np.frombuffer(source, dtype=np.uint8)
+    digits = buf - np.uint8(ord('0'))  # wraps around below '0'
+    is_digit = digits < 10
+
+    # numbers are the runs of digits, they start and end where is_digit flips
+    bounds = np.flatnonzero(np.diff(is_digit, prepend=False, append=False))
+    starts, ends = bounds[0::2], bounds[1::2]
+    lengths = ends - starts
+    longest = int(lengths.max()) if len(lengths) else 0
+    if longest > _MAX_DIGITS:
+        pos = int(starts[lengths.argmax()])
+        raise ValueError(f'number at byte {pos} does not fit in 64 bits')
+
+    # one pass per digit position over all the numbers at once
+    values = np.zeros(len(starts), dtype=np.int64)
+    for k in range(longest):
+        digit = np.take(digits, starts + k, mode='clip')
+        values = np.where(k < lengths, values * 10 + digit, values)
+
+    if signed and len(starts):
+        before = starts - 1
+        negative = (before >= 0) & (buf[np.maximum(before, 0)] == ord('-'))
+        np.negative(values, out=values, where=negative)
+
+    return IntArray(values, buf, starts)
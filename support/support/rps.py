@@ -0,0 +1,159 @@
+"""Rock paper scissors strategy guide scores (day02) from 9 line tables.
+
+A guide only ever has the lines ``A X`` to ``C Z``, so its score is how
+often each of them occurs times what it is worth::
+
+    counts = line_counts(s)        # 9 counts, index 3 * him + column
+    score(counts, MOVE_SCORES)     # part 1, dot product of 9 terms
+
+A ruleset, how the second column is read, is nothing but such a table.
+Any number of them are scored against one count of the guide at once::
+
+    scores(counts, column_permutations())  # {'XYZ=RPS': ..., ...}
+
+Counting compares the raw bytes 4 at a time against the 9 possible
+``'A X\\n'`` words, no ``str`` per round and no dict lookups.
+"""
+from __future__ import annotations
+
+import collections
+import itertools
+import os
+from typing import Callable
+from typing import Iterable
+from typing import Mapping
+
+import numpy as np
+
+from support.inputs import MappedInput
+
+# every possible line, at index 3 * him + column, him is A B C (rock
+# paper scissors), the column X Y Z
+LINES = tuple(f'{him} {column}' for him in 'ABC' for column in 'XYZ')
+_HIM, _COLUMN = np.divmod(np.arange(9), 3)
+
+MOVES = 'RPS'  # rock paper scissors, 0 1 2 like A B C
+
+Rule = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def score_table(my_move: Rule) -> np.ndarray:
+    """The score of every line when I play ``my_move(him, column)``.
+
+    ``my_move`` gets the 9 ``him`` and ``column`` values (0 1 2) of the
+    lines as arrays.  The move is worth 1 2 3 and losing, drawing and
+    winning 0 3 6.
+    """
+    move = my_move(_HIM, _COLUMN) % 3
+    return move + 1 + 3 * ((move - _HIM + 1) % 3)
+
+
+# part 1: the column is my move
+MOVE_SCORES = score_table(lambda him, column: column)
+# part 2: the column is the outcome to lose, draw or win, my move follows
+OUTCOME_SCORES = score_table(lambda him, column: him + column - 1)
+
+
+def column_permutations() -> dict[str, np.ndarray]:
+    """A table for each of the 6 ways X Y Z could stand for moves."""
+    return {
+        f'XYZ={"".join(MOVES[m] for m in moves)}': score_table(
+            lambda him, column, moves=moves: np.array(moves)[column],
+        )
+        for moves in itertools.permutations(range(3))
+    }
+
+
+def _index(line: str) -> int:
+    him, column = line.split()
+    if him not in ('A', 'B', 'C') or column not in ('X', 'Y', 'Z'):
+        raise ValueError(f'unexpected line {line!r}')
+    return 3 * (ord(him) - ord('A')) + ord(column) - ord('X')
+
+
+def _count_lines(lines: Iterable[str]) -> np.ndarray:
+    counts = np.zeros(9, dtype=np.int64)
+    # the guide has at most 9 distinct lines, only they get parsed
+    for line, n in collections.Counter(lines).items():
+        if line and not line.isspace():
+            counts[_index(line)] += n
+    return counts
+
+
+# every possible 'A X\n' line as one little endian 32 bit word
+_LINE_WORDS = np.array(
+    [int.from_bytes(f'{line}\n'.encode(), 'little') for line in LINES],
+    dtype='<u4',
+)
+
+
+def _count_bytes(data: bytes | memoryview) -> np.ndarray:
+    buf = np.frombuffer(data, dtype=np.uint8)
+    if len(buf) % 4 == 0:
+        # the usual guide is nothing but 4 byte lines, compare whole words
+        words = buf.view('<u4')
+        counts = np.array(
+            [np.count_nonzero(words == word) for word in _LINE_WORDS],
+            dtype=np.int64,
+        )
+        if counts.sum() == len(words):
+            return counts
+
+    # anything else (\r\n, no last newline): pick out the letters
+    him = buf[(buf >= ord('A')) & (buf <= ord('C'))] - np.uint8(ord('A'))
+    column = buf[(buf >= ord('X')) & (buf <= ord('Z'))] - np.uint8(ord('X'))
+    if len(him) != len(column):
+        raise ValueError('every line needs one of ABC and one of XYZ')
+    return np.bincount(3 * him.astype(np.intp) + column, minlength=9)
+
+
+def line_counts(
+        s: str | bytes | MappedInput | Iterable[str] | os.PathLike[str],
+) -> np.ndarray:
+    """How often every possible line occurs in ``s``, see ``MOVE_SCORES``.
+
+    ``s`` is the whole guide, an iterable of its lines, a ``MappedInput``
+    or the path of a file.  A memory mapped file is counted without a copy.
+    """
+    if isinstance(s, str):
+        s = s.encode()
+    if isinstance(s, bytes):
+        return _count_bytes(s)
+    if isinstance(s, os.PathLike):
+        with MappedInput(s) as mapped:
+            return line_counts(mapped)
+    if isinstance(s, MappedInput):
+        view = s.view
+        try:
+            return _count_bytes(view)
+        finally:
+            view.release()
+    return _count_lines(s)
+
+
+def score(counts: np.ndarray, table: np.ndarray) -> int:
+    """The total score of a guide with ``counts`` lines, by ``table``."""
+    return int(counts @ table)
+
+
+def score_matrix(tables: Iterable[np.ndarray]) -> np.ndarray:
+    """The tables as the rows of one ``(N, 9)`` matrix."""
+    matrix = np.array(list(tables), dtype=np.int64)
+    if matrix.size == 0:
+        return matrix.reshape(0, 9)
+    if matrix.ndim != 2 or matrix.shape[1] != 9:
+        raise ValueError(f'score tables need 9 entries, got {matrix.shape}')
+    return matrix
+
+
+def scores(
+        counts: np.ndarray,
+        rulesets: Mapping[str, np.ndarray],
+) -> dict[str, int]:
+    """The total score of a guide by every ruleset, in one product.
+
+    The guide is counted once by ``line_counts``, however many rulesets
+    there are they only add rows to a tiny matrix.
+    """
+    matrix = score_matrix(rulesets.values())
+    return dict(zip(rulesets, (matrix @ counts).tolist()))
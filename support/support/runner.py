@@ -0,0 +1,321 @@
+"""Run ``compute`` of every ``dayNN/partN.py`` in a process pool.
+
+Each part runs in a worker process, so the whole calendar takes roughly
+as long as the slowest part instead of the sum of all of them.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+import io
+import itertools
+import os
+import re
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+
+from support import events
+from support.cache import CachedResult
+from support.cache import input_digest
+from support.cache import ResultCache
+from support.cache import source_digest
+from support.events import format_ns
+from support.events import JsonlSink
+from support.events import phase_summary
+from support.events import TimingEvent
+from support.inputs import InputStore
+from support.inputs import open_input
+from support.inputs import YEAR
+from support.memory import AllocationSite
+from support.memory import format_bytes
+from support.memory import memory
+from support.spans import format_tree
+from support.spans import recording
+from support.spans import SpanNode
+
+DAY_RE = re.compile(r'day(\d+)')
+PART_RE = re.compile(r'part(\d+)\.py')
+
+
+@dataclass(frozen=True)
+class Part:
+    day: int
+    part: int
+    path: Path
+
+    @property
+    def name(self) -> str:
+        return f'day{self.day:02}/part{self.part}'
+
+    @property
+    def module(self) -> str:
+        return f'day{self.day:02}.part{self.part}'
+
+    @property
+    def root(self) -> Path:
+        return self.path.parent.parent
+
+    @property
+    def input_txt(self) -> Path:
+        return self.path.parent / 'input.txt'
+
+
+@dataclass
+class PartResult:
+    part: Part
+    result: Any = None
+    wall_ns: int = 0
+    cpu_ns: int = 0
+    source: str = ''
+    error: str | None = None
+    cached: bool = False
+    peak_traced: int | None = None
+    peak_rss: int | None = None
+    top: list[AllocationSite] = field(default_factory=list)
+    events: list[TimingEvent] = field(default_factory=list)
+    spans: SpanNode | None = None
+
+
+def discover_parts(
+        root: str | os.PathLike[str] = '.',
+        days: set[int] | None = None,
+) -> list[Part]:
+    """Find every ``dayNN/partN.py`` under root, skipping the day00 template."""
+    parts = []
+    for folder in Path(root).absolute().iterdir():
+        day_match = DAY_RE.fullmatch(folder.name)
+        if not folder.is_dir() or not day_match:
+            continue
+        day = int(day_match[1])
+        if day == 0 or (days and day not in days):
+            continue
+        for file in folder.iterdir():
+            if part_match := PART_RE.fullmatch(file.name):
+                parts.append(Part(day, int(part_match[1]), file))
+    return sorted(parts, key=lambda p: (p.day, p.part))
+
+
+def import_part(part: Part) -> Any:
+    if str(part.root) not in sys.path:
+        sys.path.insert(0, str(part.root))
+    return importlib.import_module(part.module)
+
+
+def read_input(
+        part: Part,
+        module: Any,
+        store: InputStore | None = None,
+) -> tuple[str, str]:
+    """Return the puzzle input and where it came from.
+
+    Tries ``input.txt``, then the local input cache (never the network)
+    and falls back to the sample ``INPUT_S``.
+    """
+    path, source = input_path(part, store)
+    if path is not None:
+        return path.read_text(), source
+    name = sample_name(module)
+    return getattr(module, name), name
+
+
+def input_path(
+        part: Part,
+        store: InputStore | None = None,
+) -> tuple[Path | None, str]:
+    """``input.txt`` or the cached input of the part's day, if any."""
+    if part.input_txt.exists():
+        return part.input_txt, 'input.txt'
+    store = store if store is not None else InputStore()
+    if (YEAR, part.day) in store:
+        return store.path(YEAR, part.day), 'cache'
+    return None, ''
+
+
+def sample_name(module: Any) -> str:
+    """``INPUT_S``, or the first of ``INPUT_S_1``, ``INPUT_S_2``, ..."""
+    names = sorted(n for n in vars(module) if n.startswith('INPUT_S'))
+    if not names:
+        raise AttributeError(f'{module.__name__} has no INPUT_S sample')
+    return names[0]
+
+
+def run_part(
+        part: Part,
+        trace_memory: int | None = None,
+        use_cache: bool = False,
+        record_spans: bool = False,
+) -> PartResult:
+    """Import the part and time a single ``compute`` call (worker side).
+
+    With ``trace_memory`` set, also record the peak memory and that many
+    top allocation sites (which makes the timings less meaningful).  With
+    ``use_cache`` an unchanged part on an unchanged input returns the
+    result of its previous run.  The timing events of the run, including
+    a ``compute`` phase for the whole call, end up in ``events``, with
+    ``record_spans`` the ``support.spans`` tree ends up in ``spans``.
+    """
+    ret = PartResult(part)
+    try:
+        module = import_part(part)
+        cache = ResultCache() if use_cache else None
+        with contextlib.ExitStack() as ctx:
+            path, ret.source = input_path(part)
+            if path is not None:
+                s = open_input(module.compute, path, ctx)()
+            else:
+                s, ret.source = read_input(part, module)
+
+            if cache is not None:
+                key = cache.key(
+                    input_digest(path if path is not None else s),
+                    source_digest(module.compute),
+                )
+                if (cached := cache.get(key)) is not None:
+                    ret.result, ret.cached = cached.result, True
+                    return ret
+
+            # some solutions print their own debug output, keep the report clean
+            output = ctx.enter_context(contextlib.redirect_stdout(io.StringIO()))
+            collector = ctx.enter_context(events.collect())
+            ctx.enter_context(events.labels(part.day, part.part))
+            if trace_memory is not None:
+                mem = ctx.enter_context(memory(top=trace_memory, report=False))
+            if record_spans:
+                ret.spans = ctx.enter_context(recording())
+            wall_before = time.perf_counter_ns()
+            cpu_before = time.process_time_ns()
+            ret.result = module.compute(s)
+            ret.cpu_ns = time.process_time_ns() - cpu_before
+            ret.wall_ns = time.perf_counter_ns() - wall_before
+            events.emit(TimingEvent('', ret.wall_ns, phase='compute'))
+        ret.events = collector.events
+        if trace_memory is not None:
+            ret.peak_traced, ret.peak_rss, ret.top = mem.peak_traced, mem.peak_rss, mem.top
+        if cache is not None:
+            cache.put(key, CachedResult(ret.result, output.getvalue()))
+    except Exception:
+        ret.error = traceback.format_exc(limit=-1).strip().splitlines()[-1]
+    return ret
+
+
+def run_parts(
+        parts: list[Part],
+        jobs: int | None = None,
+        trace_memory: int | None = None,
+        use_cache: bool = False,
+        record_spans: bool = False,
+) -> list[PartResult]:
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(
+            run_part, parts,
+            itertools.repeat(trace_memory), itertools.repeat(use_cache),
+            itertools.repeat(record_spans),
+        ))
+
+
+def format_report(results: list[PartResult], wall_ns: int) -> str:
+    with_memory = any(r.peak_traced is not None for r in results)
+    header = ('part', 'source', 'wall', 'cpu')
+    if with_memory:
+        header += ('peak', 'rss')
+    rows = [header + ('result',)]
+    for r in results:
+        source = f'{r.source} (cached)' if r.cached else r.source
+        row: tuple[str, ...] = (
+            r.part.name, source, format_ns(r.wall_ns), format_ns(r.cpu_ns),
+        )
+        if with_memory:
+            row += (format_bytes(r.peak_traced or 0), format_bytes(r.peak_rss or 0))
+        row += (f'ERROR: {r.error}' if r.error else repr(r.result),)
+        rows.append(row)
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = [
+        '  '.join(
+            (*(col.ljust(w) for col, w in zip(row, widths)), row[-1])
+        ).rstrip()
+        for row in rows
+    ]
+    for r in results:
+        if r.top:
+            lines.append(f'{r.part.name} top allocations:')
+            lines.extend(f'    {site}' for site in r.top)
+    for r in results:
+        if r.spans is not None:
+            lines.append(f'{r.part.name} spans:')
+            lines.extend(f'    {line}' for line in format_tree(r.spans).splitlines())
+    cpu_ns = sum(r.cpu_ns for r in results)
+    slowest = max(results, key=lambda r: r.wall_ns)
+    lines.append(
+        f'> {len(results)} parts, wall {format_ns(wall_ns)}, '
+        f'cpu {format_ns(cpu_ns)}, '
+        f'slowest {slowest.part.name} ({format_ns(slowest.wall_ns)})'
+    )
+    return '\n'.join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='run every dayNN/partN.py compute in parallel',
+    )
+    parser.add_argument('days', nargs='*', type=int, help='only these days')
+    parser.add_argument('--root', default='.', help='calendar root folder')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=None,
+        help='worker processes (default: cpu count)',
+    )
+    parser.add_argument(
+        '--memory', nargs='?', type=int, const=3, default=None, metavar='TOP',
+        help='trace peak memory and the TOP allocation sites (default 3)',
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='always run compute, ignoring cached results',
+    )
+    parser.add_argument(
+        '--events', metavar='FILE',
+        help='append the timing events of every part to FILE (jsonl)',
+    )
+    parser.add_argument(
+        '--phases', action='store_true',
+        help='print the time spent in every timed phase of every part',
+    )
+    parser.add_argument(
+        '--spans', action='store_true',
+        help='record the support.spans of every part and print their trees',
+    )
+    args = parser.parse_args(argv)
+
+    parts = discover_parts(args.root, set(args.days))
+    if not parts:
+        print(f'no parts found in {os.path.abspath(args.root)}', file=sys.stderr)
+        return 1
+
+    before = time.perf_counter_ns()
+    # memory tracing, timing events and spans need the real thing
+    use_cache = (
+        not args.no_cache and args.memory is None and
+        args.events is None and not args.phases and not args.spans
+    )
+    results = run_parts(parts, args.jobs, args.memory, use_cache, args.spans)
+    wall_ns = time.perf_counter_ns() - before
+
+    print(format_report(results, wall_ns))
+    all_events = [event for r in results for event in r.events]
+    if args.events is not None:
+        sink = JsonlSink(args.events)
+        for event in all_events:
+            sink(event)
+    if args.phases:
+        print(phase_summary(all_events))
+    return int(any(r.error for r in results))
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,216 @@
+"""Nested timing spans and counters for the hot paths of a ``compute``.
+
+    @traced()
+    def collision(self, rock): ...
+
+    with span('pairs'):
+        for ...:
+            count('pairs checked')
+
+Off by default and then (nearly) free: a ``@traced`` function stays the
+plain function until ``recording`` swaps in a timed wrapper, ``span`` and
+``count`` are one global check.  ``run-all --spans`` and ``python partN.py
+--spans`` record every part and print a flame style tree::
+
+    compute          1.20 s  100.0%      1 calls
+      process_rock   1.19 s   99.2%   4000 calls
+        collision  420.1 ms   35.0%  91234 calls
+      rocks: 4000
+
+Recursive calls of the same span count once, with the outermost time.
+"""
+from __future__ import annotations
+
+import contextlib
+import functools
+import sys
+import time
+from typing import Any
+from typing import Callable
+from typing import Generator
+from typing import TypeVar
+
+from support.events import format_ns
+
+TCallable = TypeVar('TCallable', bound=Callable[..., Any])
+
+
+class SpanNode:
+    """Total time, calls and counters of one span below its parent."""
+
+    __slots__ = ('name', 'ns', 'calls', 'children', 'counters', '_depth', '_start')
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.ns = 0
+        self.calls = 0
+        self.children: dict[str, SpanNode] = {}
+        self.counters: dict[str, int] = {}
+        self._depth = 0
+        self._start = 0
+
+    def __getstate__(self) -> tuple[Any, ...]:
+        return self.name, self.ns, self.calls, self.children, self.counters
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        self.name, self.ns, self.calls, self.children, self.counters = state
+        self._depth = self._start = 0
+
+    def format(
+            self,
+            total_ns: int | None = None,
+            indent: int = 0,
+    ) -> list[list[str]]:
+        """The rows of the flame tree, ``name``, time, share and calls."""
+        total_ns = total_ns or self.ns or 1
+        rows = [[
+            f'{"  " * indent}{self.name}',
+            format_ns(self.ns),
+            f'{self.ns / total_ns:.1%}',
+            f'{self.calls} calls',
+        ]]
+        for child in sorted(self.children.values(), key=lambda c: -c.ns):
+            rows.extend(child.format(total_ns, indent + 1))
+        rows.extend(
+            [f'{"  " * (indent + 1)}{name}: {n}', '', '', '']
+            for name, n in self.counters.items()
+        )
+        return rows
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.name!r}, ns={self.ns})'
+
+
+def format_tree(root: SpanNode) -> str:
+    rows = root.format()
+    widths = [max(len(row[i]) for row in rows) for i in range(4)]
+    return '\n'.join(
+        '  '.join((
+            row[0].ljust(widths[0]),
+            row[1].rjust(widths[1]),
+            row[2].rjust(widths[2]),
+            row[3].rjust(widths[3]),
+        )).rstrip()
+        for row in rows
+    )
+
+
+# the stack of open spans while recording, None otherwise
+_stack: list[SpanNode] | None = None
+
+
+def _enter(name: str) -> SpanNode:
+    assert _stack is not None
+    parent = _stack[-1]
+    # recursion stays on the same node instead of nesting deeper and deeper
+    if parent.name == name:
+        node = parent
+    else:
+        node = parent.children.get(name)
+        if node is None:
+            node = parent.children[name] = SpanNode(name)
+    node.calls += 1
+    if not node._depth:
+        node._start = time.perf_counter_ns()
+    node._depth += 1
+    _stack.append(node)
+    return node
+
+
+def _exit(node: SpanNode) -> None:
+    assert _stack is not None
+    node._depth -= 1
+    if not node._depth:
+        node.ns += time.perf_counter_ns() - node._start
+    _stack.pop()
+
+
+@contextlib.contextmanager
+def _span(name: str) -> Generator[None, None, None]:
+    node = _enter(name)
+    try:
+        yield
+    finally:
+        _exit(node)
+
+
+_NOT_RECORDING = contextlib.nullcontext()
+
+
+def span(name: str) -> contextlib.AbstractContextManager[None]:
+    """Time the block as a child of the current span."""
+    if _stack is None:
+        return _NOT_RECORDING
+    return _span(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add ``n`` to the counter ``name`` of the current span."""
+    if _stack is not None:
+        counters = _stack[-1].counters
+        counters[name] = counters.get(name, 0) + n
+
+
+# every @traced function: (function, span name)
+_traced: list[tuple[Callable[..., Any], str]] = []
+
+
+def traced(name: str | None = None) -> Callable[[TCallable], TCallable]:
+    """Time every call of the decorated function (while recording).
+
+    The function itself is returned, ``recording`` replaces it on its
+    module or class by a timed wrapper and puts it back afterwards.  Only
+    calls going through that name are timed, so don't use it on nested
+    functions or on aliases hoisted out of a loop.
+    """
+    def traced_decorator(func: TCallable) -> TCallable:
+        _traced.append((func, name or func.__name__))
+        return func
+    return traced_decorator
+
+
+def _timed(func: Callable[..., Any], name: str) -> Callable[..., Any]:
+    @functools.wraps(func)
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        node = _enter(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _exit(node)
+    return timed
+
+
+def _owner(func: Callable[..., Any]) -> Any:
+    """The module or class ``func`` is an attribute of, if any."""
+    owner: Any = sys.modules.get(func.__module__)
+    *path, _ = func.__qualname__.split('.')
+    for part in path:
+        owner = getattr(owner, part, None)
+    return owner
+
+
+@contextlib.contextmanager
+def recording(name: str = 'compute') -> Generator[SpanNode, None, None]:
+    """Record the spans and counters of the block under a root ``name``."""
+    global _stack
+    if _stack is not None:
+        raise RuntimeError('already recording')
+
+    patched = []
+    for func, span_name in _traced:
+        owner = _owner(func)
+        if owner is not None and vars(owner).get(func.__name__) is func:
+            setattr(owner, func.__name__, _timed(func, span_name))
+            patched.append((owner, func))
+
+    root = SpanNode(name)
+    root.calls = 1
+    _stack = [root]
+    before = time.perf_counter_ns()
+    try:
+        yield root
+    finally:
+        root.ns = time.perf_counter_ns() - before
+        _stack = None
+        for owner, func in patched:
+            setattr(owner, func.__name__, func)
@@ -0,0 +1,211 @@
+"""Sparse grids keyed by packed ints instead of coordinate tuples.
+
+Every member of a set of ``(x, y)`` tuples is a tuple holding two ints,
+about 110 bytes, and every lookup hashes the tuple.  ``CoordCodec`` packs
+a coordinate into a single int, one field of ``bits`` bits per axis::
+
+    key = (x + offset) | (y + offset) << bits | (z + offset) << 2 * bits
+
+Adding ``codec.delta(d)`` to a key moves it by ``d`` as long as the
+coordinates stay within ``-offset <= c < 2 ** bits - offset``, so hot
+loops can step around on the ``packed`` dict of a ``SparseGrid`` without
+ever building a tuple.
+
+>>> grid = SparseGrid([(0, 0), (1, 2)])
+>>> (1, 2) in grid, (2, 1) in grid
+(True, False)
+>>> grid.codec.encode((0, 0)) + grid.codec.delta((1, 2)) in grid.packed
+True
+"""
+from __future__ import annotations
+
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import MutableMapping
+from typing import Sequence
+
+
+class CoordCodec:
+    """Packs ``dims`` dimensional integer coordinates into single ints.
+
+    The coordinates are not range checked, out of range values silently
+    collide with other coordinates.
+    """
+
+    __slots__ = ('dims', 'bits', 'offset', 'mask', '_origin')
+
+    def __init__(self, dims: int = 2, bits: int = 20, offset: int | None = None) -> None:
+        self.dims = dims
+        self.bits = bits
+        self.offset = 1 << (bits - 1) if offset is None else offset
+        self.mask = (1 << bits) - 1
+        self._origin = sum(self.offset << (bits * i) for i in range(dims))
+
+    @property
+    def min_coord(self) -> int:
+        return -self.offset
+
+    @property
+    def max_coord(self) -> int:
+        return self.mask - self.offset
+
+    def delta(self, d: Sequence[int]) -> int:
+        """What to add to a key to move it by ``d``."""
+        return sum(c << (self.bits * i) for i, c in enumerate(d))
+
+    def encode(self, coord: Sequence[int]) -> int:
+        return self._origin + self.delta(coord)
+
+    def decode(self, key: int) -> tuple[int, ...]:
+        return tuple(
+            ((key >> (self.bits * i)) & self.mask) - self.offset
+            for i in range(self.dims)
+        )
+
+    def __eq__(self, other: object) -> bool:
+        # the unrolled subclasses pack exactly like the generic codec
+        if not isinstance(other, CoordCodec):
+            return NotImplemented
+        return (
+            (self.dims, self.bits, self.offset) ==
+            (other.dims, other.bits, other.offset)
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.dims, self.bits, self.offset))
+
+    def __repr__(self) -> str:
+        return (
+            f'{type(self).__name__}(dims={self.dims}, bits={self.bits}, '
+            f'offset={self.offset})'
+        )
+
+
+class CoordCodec2(CoordCodec):
+    """Unrolled 2D version, the one ``SparseGrid`` uses."""
+
+    __slots__ = ()
+
+    def __init__(self, bits: int = 20, offset: int | None = None) -> None:
+        super().__init__(2, bits, offset)
+
+    def delta(self, d: Sequence[int]) -> int:
+        x, y = d
+        return x + (y << self.bits)
+
+    def encode(self, coord: Sequence[int]) -> int:
+        x, y = coord
+        return self._origin + x + (y << self.bits)
+
+    def decode(self, key: int) -> tuple[int, int]:
+        return (key & self.mask) - self.offset, (key >> self.bits) - self.offset
+
+
+class CoordCodec3(CoordCodec):
+    """Unrolled 3D version, the one ``SparseGrid3`` uses."""
+
+    __slots__ = ()
+
+    def __init__(self, bits: int = 20, offset: int | None = None) -> None:
+        super().__init__(3, bits, offset)
+
+    def delta(self, d: Sequence[int]) -> int:
+        x, y, z = d
+        return x + (y << self.bits) + (z << 2 * self.bits)
+
+    def encode(self, coord: Sequence[int]) -> int:
+        x, y, z = coord
+        return self._origin + x + (y << self.bits) + (z << 2 * self.bits)
+
+    def decode(self, key: int) -> tuple[int, int, int]:
+        bits, mask, offset = self.bits, self.mask, self.offset
+        return (
+            (key & mask) - offset,
+            ((key >> bits) & mask) - offset,
+            (key >> 2 * bits) - offset,
+        )
+
+
+class SparseGrid(MutableMapping[Any, Any]):
+    """``dict`` of ``(x, y)`` coordinates, stored under packed int keys.
+
+    Also works as a set of coordinates: ``add`` / ``discard`` / ``|=``
+    store ``True`` for a coordinate, and ``update`` accepts either a
+    mapping or an iterable of coordinates.  ``packed`` is the underlying
+    ``{key: value}`` dict for hot loops.
+    """
+
+    def __init__(
+            self,
+            items: Mapping[Any, Any] | Iterable[Any] = (),
+            codec: CoordCodec | None = None,
+    ) -> None:
+        self.codec = codec if codec is not None else self._default_codec()
+        self.packed: dict[int, Any] = {}
+        self.update(items)
+
+    @staticmethod
+    def _default_codec() -> CoordCodec:
+        return CoordCodec2()
+
+    def __getitem__(self, coord: Any) -> Any:
+        try:
+            return self.packed[self.codec.encode(coord)]
+        except KeyError:
+            raise KeyError(coord) from None
+
+    def __setitem__(self, coord: Any, value: Any) -> None:
+        self.packed[self.codec.encode(coord)] = value
+
+    def __delitem__(self, coord: Any) -> None:
+        try:
+            del self.packed[self.codec.encode(coord)]
+        except KeyError:
+            raise KeyError(coord) from None
+
+    def __contains__(self, coord: object) -> bool:
+        return self.codec.encode(coord) in self.packed  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self.codec.decode, self.packed)
+
+    def __len__(self) -> int:
+        return len(self.packed)
+
+    def add(self, coord: Any) -> None:
+        self.packed[self.codec.encode(coord)] = True
+
+    def discard(self, coord: Any) -> None:
+        self.packed.pop(self.codec.encode(coord), None)
+
+    def update(  # type: ignore[override]
+            self,
+            items: Mapping[Any, Any] | Iterable[Any] = (),
+    ) -> None:
+        encode = self.codec.encode
+        if isinstance(items, SparseGrid) and items.codec == self.codec:
+            self.packed.update(items.packed)
+        elif isinstance(items, Mapping):
+            self.packed.update((encode(k), v) for k, v in items.items())
+        else:
+            self.packed.update(dict.fromkeys(map(encode, items), True))
+
+    def __ior__(self, items: Mapping[Any, Any] | Iterable[Any]) -> SparseGrid:
+        self.update(items)
+        return self
+
+    def clear(self) -> None:
+        self.packed.clear()
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict(self.items())!r})'
+
+
+class SparseGrid3(SparseGrid):
+    """``SparseGrid`` of ``(x, y, z)`` coordinates."""
+
+    @staticmethod
+    def _default_codec() -> CoordCodec:
+        return CoordCodec3()
@@ -0,0 +1,209 @@
+"""Run the tests of every ``dayNN/partN.py`` in parallel, with a time budget.
+
+Each part gets its own ``pytest`` process, a part running over
+``--timeout`` seconds is killed instead of holding up the whole run.  The
+report ends with the slowest parts and their peak memory (the max rss of
+the pytest process, python and pytest included)::
+
+    test-all                    # the default markers of pytest.ini
+    test-all -m solved 15 16    # only the solved tests of days 15 and 16
+    test-all --timeout 10 --slowest 5 -- -x
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Sequence
+
+from support.events import format_ns
+from support.memory import format_bytes
+from support.memory import maxrss_bytes
+from support.runner import discover_parts
+from support.runner import Part
+
+# pytest exit codes
+_PASSED = 0
+_NO_TESTS = 5
+
+
+@dataclass
+class PartRun:
+    part: Part
+    status: str = ''
+    wall_ns: int = 0
+    peak_rss: int | None = None
+    output: str = ''
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ('passed', 'no tests')
+
+
+def _wait(
+        proc: subprocess.Popen[bytes],
+        timeout: float,
+) -> tuple[int | None, int | None]:
+    """Wait for ``proc`` at most ``timeout`` seconds, killing it after.
+
+    Returns the exit code (None when it was killed) and its peak rss.
+    """
+    deadline = time.monotonic() + timeout
+    if not hasattr(os, 'wait4'):  # pragma: no cover (windows)
+        try:
+            return proc.wait(timeout), None
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            return None, None
+
+    killed = False
+    while True:
+        # wait4 reaps the process, Popen must not wait for it again
+        pid, status, rusage = os.wait4(proc.pid, 0 if killed else os.WNOHANG)
+        if pid:
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            rss = maxrss_bytes(rusage.ru_maxrss)
+            return (None if killed else proc.returncode), rss
+        if time.monotonic() > deadline:
+            # the whole session, pytest may have started processes of its own
+            os.killpg(proc.pid, signal.SIGKILL)
+            killed = True
+        else:
+            time.sleep(0.01)
+
+
+def run_part_tests(
+        part: Part,
+        timeout: float,
+        pytest_args: Sequence[str] = (),
+) -> PartRun:
+    """Run pytest on one part in its own process (thread side)."""
+    ret = PartRun(part)
+    cmd = (
+        sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider',
+        *pytest_args, str(part.path),
+    )
+    # a file instead of a pipe, nobody reads a pipe while we poll
+    with tempfile.TemporaryFile() as output:
+        before = time.perf_counter_ns()
+        proc = subprocess.Popen(
+            cmd, cwd=part.root, stdout=output, stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+        code, ret.peak_rss = _wait(proc, timeout)
+        ret.wall_ns = time.perf_counter_ns() - before
+        output.seek(0)
+        ret.output = output.read().decode(errors='replace')
+
+    if code is None:
+        ret.status = f'timeout ({timeout:g} s)'
+    elif code == _PASSED:
+        ret.status = 'passed'
+    elif code == _NO_TESTS:
+        ret.status = 'no tests'
+    else:
+        ret.status = 'failed'
+    return ret
+
+
+def run_all_tests(
+        parts: list[Part],
+        timeout: float,
+        pytest_args: Sequence[str] = (),
+        jobs: int | None = None,
+) -> list[PartRun]:
+    # the work happens in the pytest processes, threads only wait for them
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        return list(executor.map(
+            lambda part: run_part_tests(part, timeout, pytest_args), parts,
+        ))
+
+
+def _table(runs: list[PartRun]) -> list[str]:
+    rows = [('part', 'status', 'time', 'peak rss')]
+    for r in runs:
+        peak = format_bytes(r.peak_rss) if r.peak_rss is not None else '?'
+        rows.append((r.part.name, r.status, format_ns(r.wall_ns), peak))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return [
+        '  '.join(col.ljust(w) for col, w in zip(row, widths)).rstrip()
+        for row in rows
+    ]
+
+
+def format_test_report(runs: list[PartRun], wall_ns: int, slowest: int) -> str:
+    lines = []
+    for r in runs:
+        if not r.ok:
+            lines.append(f'{f" {r.part.name} {r.status} ":=^70}')
+            lines.extend(r.output.rstrip().splitlines()[-30:])
+    lines.extend(_table(runs))
+
+    if slowest:
+        lines.append(f'slowest {min(slowest, len(runs))}:')
+        by_time = sorted(runs, key=lambda r: -r.wall_ns)[:slowest]
+        lines.extend(f'    {line}' for line in _table(by_time))
+
+    failed = sum(r.status == 'failed' for r in runs)
+    timed_out = sum(r.status.startswith('timeout') for r in runs)
+    lines.append(
+        f'> {len(runs)} parts, {len(runs) - failed - timed_out} ok, '
+        f'{failed} failed, {timed_out} timed out, wall {format_ns(wall_ns)}'
+    )
+    return '\n'.join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='run the tests of every dayNN/partN.py in parallel',
+        epilog='arguments after -- are passed on to pytest',
+    )
+    parser.add_argument('days', nargs='*', type=int, help='only these days')
+    parser.add_argument('--root', default='.', help='calendar root folder')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=None,
+        help='parts tested at once (default: cpu count)',
+    )
+    parser.add_argument(
+        '--timeout', type=float, default=60, metavar='SECONDS',
+        help='kill the tests of a part after this long (default 60)',
+    )
+    parser.add_argument(
+        '--slowest', type=int, default=10, metavar='N',
+        help='list the N slowest parts (default 10, 0 to disable)',
+    )
+    parser.add_argument(
+        '-m', dest='markers',
+        help='pytest marker expression (default: the one of pytest.ini)',
+    )
+    argv = sys.argv[1:] if argv is None else argv
+    # anything after -- goes to pytest as is
+    split = argv.index('--') if '--' in argv else len(argv)
+    argv, pytest_args = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+
+    parts = discover_parts(args.root, set(args.days))
+    if not parts:
+        print(f'no parts found in {os.path.abspath(args.root)}', file=sys.stderr)
+        return 1
+
+    if args.markers is not None:
+        pytest_args[:0] = ['-m', args.markers]
+
+    before = time.perf_counter_ns()
+    runs = run_all_tests(parts, args.timeout, pytest_args, args.jobs)
+    wall_ns = time.perf_counter_ns() - before
+
+    print(format_test_report(runs, wall_ns, args.slowest))
+    return int(not all(r.ok for r in runs))
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
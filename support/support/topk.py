@@ -0,0 +1,146 @@
+"""The ``k`` largest totals of blank line separated records (day01).
+
+    top_k(s, 3)              # a whole str: numpy sums and argpartition
+    top_k(mapped.lines(), 3) # any other iterable of lines: streamed
+    top_k(mapped, 3)         # a MappedInput or a path: chunks summed in
+                             # a process pool
+
+The streaming side keeps a heap of the ``k`` best totals seen so far, one
+pass and O(k) memory however many elves the inventory lists.  A file is
+memory mapped and cut at blank lines into chunks of whole records, every
+worker sums the records of its chunks with ``np.add.reduceat`` and only
+their top ``k`` come back to be merged.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable
+from typing import TYPE_CHECKING
+
+from support.inputs import MappedInput
+from support.parse import int_array
+from support.parse import records
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _check_k(k: int) -> None:
+    if k < 1:
+        raise ValueError(f'k must be at least 1, got {k}')
+
+
+def top_k_stream(lines: Iterable[str], k: int = 3) -> list[int]:
+    """The ``k`` largest record totals of ``lines``, largest first."""
+    _check_k(k)
+    heap: list[int] = []  # min heap, heap[0] is the one to beat
+    for record in records(lines):
+        total = sum(map(int, record))
+        if len(heap) < k:
+            heapq.heappush(heap, total)
+        elif total > heap[0]:
+            heapq.heapreplace(heap, total)
+    return sorted(heap, reverse=True)
+
+
+def top_k_sums(sums: np.ndarray, k: int = 3) -> list[int]:
+    """The ``k`` largest of ``sums``, largest first."""
+    import numpy as np
+
+    _check_k(k)
+    if k < len(sums):
+        # only the k winners get sorted, not every elf
+        sums = sums[np.argpartition(sums, -k)[-k:]]
+    return sorted(sums.tolist(), reverse=True)
+
+
+_BLANK_LINE_RE = re.compile(rb'\n\r?\n')
+
+
+def record_bounds(
+        buf: bytes | memoryview,
+        chunk_size: int,
+) -> list[tuple[int, int]]:
+    """``(start, end)`` byte ranges of about ``chunk_size`` bytes each.
+
+    Every range but the last ends right after a blank line, so no record
+    is ever split between two of them.
+    """
+    bounds = []
+    start = 0
+    while start < len(buf):
+        match = _BLANK_LINE_RE.search(buf, start + chunk_size)
+        end = match.end() if match is not None else len(buf)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def _record_sums(chunk: memoryview) -> np.ndarray:
+    # the sums are a new array, nothing keeps the chunk exported after
+    return int_array(chunk).record_sums()
+
+
+def _chunk_top_k(
+        path: str | os.PathLike[str],
+        start: int,
+        end: int,
+        k: int,
+) -> list[int]:
+    """The top ``k`` of one chunk (runs in the workers)."""
+    with MappedInput(path) as mapped:
+        view = mapped.view
+        try:
+            return top_k_sums(_record_sums(view[start:end]), k)
+        finally:
+            view.release()
+
+
+def top_k_file(
+        path: str | os.PathLike[str],
+        k: int = 3,
+        *,
+        jobs: int | None = None,
+        chunk_size: int = 64 << 20,
+) -> list[int]:
+    """The ``k`` largest totals of a file, chunks summed in ``jobs`` processes.
+
+    Workers map the file themselves and get byte ranges, not text, so
+    only the partial top ``k`` lists cross process boundaries.  A single
+    chunk (or ``jobs=1``) is summed right here.
+    """
+    _check_k(k)
+    with MappedInput(path) as mapped:
+        view = mapped.view
+        try:
+            bounds = record_bounds(view, chunk_size)
+        finally:
+            view.release()
+
+    starts = [start for start, _ in bounds]
+    ends = [end for _, end in bounds]
+    args = ([path] * len(bounds), starts, ends, [k] * len(bounds))
+    if jobs == 1 or len(bounds) <= 1:
+        partials = list(map(_chunk_top_k, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            partials = list(executor.map(_chunk_top_k, *args))
+    return heapq.nlargest(k, itertools.chain.from_iterable(partials))
+
+
+def top_k(
+        s: str | MappedInput | Iterable[str] | os.PathLike[str],
+        k: int = 3,
+) -> list[int]:
+    """The ``k`` largest totals, in bulk for a str or a file, else streamed."""
+    if isinstance(s, str):
+        return top_k_sums(int_array(s).record_sums(), k)
+    if isinstance(s, MappedInput):
+        return top_k_file(s.path, k)
+    if isinstance(s, os.PathLike):
+        return top_k_file(s, k)
+    return top_k_stream(s, k)
@@ -0,0 +1,104 @@
+"""``support.cache`` keys and eviction, on throwaway parts and caches."""
+import os
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+from support.cache import CachedResult
+from support.cache import part_digest
+from support.cache import ResultCache
+from support.cache import SUPPORT_DIR
+from support.cache import source_files
+
+PART = '''\
+import collections
+
+from day99.helper import double
+from support.parse import ints
+
+
+def compute(s):
+    return double(sum(ints(s)))
+'''
+
+
+def make_day(root: Path) -> Path:
+    day = root.resolve() / 'day99'
+    day.mkdir()
+    (day / '__init__.py').write_text('')
+    (day / 'helper.py').write_text(
+        'from day99 import util\n\n\ndef double(n):\n    return 2 * n\n',
+    )
+    (day / 'util.py').write_text('')
+    (day / 'unrelated.py').write_text('')
+    (day / 'part1.py').write_text(PART)
+    return day / 'part1.py'
+
+
+def test_source_files(tmp_path: Path) -> None:
+    part = make_day(tmp_path)
+    day = part.parent
+    files = source_files(part)
+    local = [f for f in files if f.parent != SUPPORT_DIR]
+    assert local == [
+        day / '__init__.py', day / 'helper.py', day / 'part1.py', day / 'util.py',
+    ]
+    assert SUPPORT_DIR / 'parse.py' in files
+    assert SUPPORT_DIR / 'cache.py' in files  # all of support, not only parse
+
+
+def test_dependency_change_invalidates(tmp_path: Path) -> None:
+    part = make_day(tmp_path)
+    before = part_digest(part)
+
+    (part.parent / 'unrelated.py').write_text('x = 1\n')
+    assert part_digest(part) == before
+
+    # two imports deep
+    (part.parent / 'util.py').write_text('x = 1\n')
+    assert part_digest(part) != before
+
+
+def test_lru_eviction(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path)
+    for key in 'abc':
+        cache.put(key, CachedResult(key * 100))
+    # a oldest, then b and c, on a coarse clock they could tie
+    for i, key in enumerate('abc'):
+        os.utime(tmp_path / f'{key}.pickle', ns=(i * 10**9, i * 10**9))
+
+    assert cache.get('a') is not None  # a is the most recent now
+    entry_size = (tmp_path / 'a.pickle').stat().st_size
+    cache.max_bytes = 2 * entry_size
+    cache.evict()
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+
+
+def test_unpicklable_result_is_not_cached(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path)
+    cache.put('f', CachedResult(lambda: 1))
+    assert cache.get('f') is None
+
+
+
+def test_stale_entries_are_dropped(
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    module = types.ModuleType('stale')
+    monkeypatch.setitem(sys.modules, 'stale', module)
+    module.Result = type('Result', (), {'__module__': 'stale'})
+    cache = ResultCache(tmp_path)
+    cache.put('renamed', CachedResult(module.Result()))
+    cache.put('moved', CachedResult(module.Result()))
+
+    del module.Result  # AttributeError on load
+    assert cache.get('renamed') is None
+    del sys.modules['stale']  # ModuleNotFoundError on load
+    assert cache.get('moved') is None
+    assert list(tmp_path.glob('*.pickle')) == []
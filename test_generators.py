@@ -0,0 +1,37 @@
+"""Every ``support.generators`` input is reproducible and a valid input."""
+import contextlib
+import importlib
+import os.path
+from pathlib import Path
+
+import pytest
+
+from support.generators import generate
+from support.generators import GENERATORS
+from support.generators import SIZES
+from support.inputs import open_input
+from support.runner import discover_parts
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+DAYS = tuple(
+    part.day
+    for part in discover_parts(HERE)
+    if part.part == 1 and part.day in GENERATORS
+)
+
+
+@pytest.mark.parametrize('day', DAYS)
+def test_deterministic(day: int) -> None:
+    size = SIZES[day][0]
+    assert generate(day, size, seed=1) == generate(day, size, seed=1)
+
+
+@pytest.mark.parametrize('day', DAYS)
+def test_part1_accepts(day: int, tmp_path: Path) -> None:
+    module = importlib.import_module(f'day{day:02}.part1')
+    path = tmp_path / 'input.txt'
+    path.write_text(generate(day, SIZES[day][0]))
+    with contextlib.ExitStack() as ctx:
+        s = open_input(module.compute, path, ctx)()
+        assert module.compute(s) is not None
@@ -0,0 +1,137 @@
+"""``support.inputs`` offline, through a ``FileBackend`` and a stub backend."""
+import contextlib
+from pathlib import Path
+
+import pytest
+
+from support import memory_mapped
+from support import streaming
+from support.cli import part_main
+from support.inputs import FileBackend
+from support.inputs import HttpBackend
+from support.inputs import InputStore
+from support.inputs import MappedInput
+from support.inputs import open_input
+from support.inputs import sha256
+from support.parse import int_array
+
+
+class CountingBackend:
+    """Serves ``data`` for every day and counts the fetches."""
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.fetches: list[tuple[int, int]] = []
+
+    def fetch(self, year: int, day: int) -> bytes:
+        self.fetches.append((year, day))
+        return self.data
+
+
+def test_file_backend(tmp_path: Path) -> None:
+    (tmp_path / '2022').mkdir()
+    (tmp_path / '2022' / 'day05.txt').write_bytes(b'1\n2\n')
+    store = InputStore(tmp_path / 'cache', FileBackend(tmp_path))
+
+    assert (2022, 5) not in store
+    assert store.text(2022, 5) == '1\n2\n'
+    assert (2022, 5) in store
+    assert store.path(2022, 5).name == sha256(b'1\n2\n')
+
+
+def test_fetches_only_on_a_miss(tmp_path: Path) -> None:
+    backend = CountingBackend(b'A Y\n')
+    store = InputStore(tmp_path, backend)
+
+    assert store.get(2022, 2) == b'A Y\n'  # miss
+    assert store.get(2022, 2) == b'A Y\n'  # hit
+    assert backend.fetches == [(2022, 2)]
+
+    # a new store on the same folder hits too
+    assert InputStore(tmp_path, backend).text(2022, 2) == 'A Y\n'
+    assert backend.fetches == [(2022, 2)]
+
+
+def test_same_input_stored_once(tmp_path: Path) -> None:
+    store = InputStore(tmp_path, CountingBackend(b'same\n'))
+    assert store.path(2022, 1) == store.path(2022, 2)
+    assert len(list((tmp_path / 'objects').iterdir())) == 1
+
+
+def test_miss_without_backend(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        InputStore(tmp_path).get(2022, 1)
+
+
+def test_corrupted_object(tmp_path: Path) -> None:
+    store = InputStore(tmp_path, CountingBackend(b'1\n'))
+    store.path(2022, 1).write_bytes(b'2\n')
+    with pytest.raises(ValueError, match='corrupted'):
+        store.get(2022, 1)
+
+
+def test_http_backend_timeout(tmp_path: Path) -> None:
+    # nothing listens on port 1, every attempt fails right away
+    backend = HttpBackend('http://127.0.0.1:1', attempts=2, delay=0)
+    with pytest.raises(TimeoutError):
+        InputStore(tmp_path, backend).get(2022, 1)
+    assert (2022, 1) not in InputStore(tmp_path)
+
+
+@pytest.mark.parametrize(
+    ('data', 'lines'),
+    (
+        (b'', []),
+        (b'1\n2\n', ['1', '2']),
+        (b'1\n2', ['1', '2']),  # no newline at the end
+        (b'1\r\n\r\n2', ['1', '', '2']),
+    ),
+)
+def test_mapped_input(data: bytes, lines: list[str], tmp_path: Path) -> None:
+    path = tmp_path / 'input.txt'
+    path.write_bytes(data)
+    with MappedInput(path) as mapped:
+        assert len(mapped) == len(data)
+        assert mapped.text() == data.decode()
+        assert list(mapped.lines()) == lines
+        # tiny chunks, every line crosses a chunk boundary
+        assert list(mapped.lines(chunk_size=1)) == lines
+        assert ''.join(mapped.chunks(chunk_size=1)) == data.decode()
+        view = mapped.view
+        assert bytes(view) == data
+        view.release()
+
+
+def test_open_input(tmp_path: Path) -> None:
+    path = tmp_path / 'input.txt'
+    path.write_text('1\n2\n')
+    with contextlib.ExitStack() as ctx:
+        text = open_input(lambda s: s, path, ctx)()
+        lines = open_input(streaming(lambda s: s), path, ctx)()
+        mapped = open_input(memory_mapped(lambda s: s), path, ctx)()
+
+        assert text == '1\n2\n'
+        assert list(lines) == ['1', '2']
+        assert isinstance(mapped, MappedInput)
+        assert mapped.path == path
+
+
+def test_close_with_live_view(tmp_path: Path) -> None:
+    path = tmp_path / 'input.txt'
+    path.write_bytes(b'1,2\n')
+    with MappedInput(path) as mapped:
+        numbers = int_array(mapped)  # keeps a view of the map
+    assert numbers.values.tolist() == [1, 2]
+
+
+@memory_mapped
+def three_per_row(s):
+    return int_array(s).rows(3).sum()
+
+
+def test_mapped_part_error_reaches_caller(tmp_path: Path) -> None:
+    path = tmp_path / 'input.txt'
+    path.write_bytes(b'1,2,3,4\n')
+    # the parse error, not a BufferError from unmapping on the way out
+    with pytest.raises(ValueError, match='reshape'):
+        part_main(three_per_row, str(path), ['--no-cache'])
@@ -0,0 +1,42 @@
+"""``support.sparse`` codecs and the packed fast path of ``SparseGrid``."""
+import pytest
+
+from support.sparse import CoordCodec
+from support.sparse import CoordCodec2
+from support.sparse import CoordCodec3
+from support.sparse import SparseGrid
+
+
+def test_codec_equality() -> None:
+    assert CoordCodec2() == CoordCodec(2)
+    assert hash(CoordCodec2()) == hash(CoordCodec(2))
+    assert CoordCodec3() == CoordCodec(3)
+    assert CoordCodec2() != CoordCodec3()
+    assert CoordCodec2(bits=16) != CoordCodec2()
+    assert CoordCodec2(offset=0) != CoordCodec2()
+
+
+def test_update_with_equal_codec_copies_keys(
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    grid = SparseGrid([(0, 0)])
+    other = SparseGrid([(1, 2), (-3, 4)])
+    assert grid.codec is not other.codec
+
+    def no_coding(*args: object) -> None:
+        raise AssertionError('the packed keys should be copied as they are')
+
+    monkeypatch.setattr(CoordCodec2, 'encode', no_coding)
+    monkeypatch.setattr(CoordCodec2, 'decode', no_coding)
+    grid.update(other)
+    grid |= other
+    monkeypatch.undo()
+
+    assert sorted(grid) == [(-3, 4), (0, 0), (1, 2)]
+
+
+def test_update_with_other_codec_recodes() -> None:
+    grid = SparseGrid([(0, 0)])
+    other = SparseGrid([(1, 2)], codec=CoordCodec2(bits=8))
+    grid.update(other)
+    assert sorted(grid) == [(0, 0), (1, 2)]